@@ -18,26 +18,171 @@ Requirements:
     ollama pull gpt-oss:20b
 """
 
-import os
-import tempfile
-from typing import Dict, Any, List, TypedDict, Optional, Literal
-from langgraph.graph import StateGraph, START, END
-from langchain_core.messages import HumanMessage, AIMessage, BaseMessage
+import functools
+import operator
+import re
+from collections import OrderedDict
+from typing import (
+    Annotated,
+    Any,
+    Literal,
+    TypedDict,
+)
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
 from langchain_ollama import ChatOllama
+from langgraph.graph import END, START, StateGraph
+
+from machine_rules.api.execution_set import Rule, RuleExecutionSet
 
 # Machine Rules imports
 from machine_rules.api.registry import RuleServiceProviderManager
-from machine_rules.api.execution_set import Rule, RuleExecutionSet
 from machine_rules.loader.yaml_loader import YAMLRuleLoader
 
+# Rule results remembered per (execution set, fact); the oldest entry goes first
+RULE_CACHE_SIZE = 4096
+
+# Marks a cache miss, since a cached rule result may itself be None
+_MISSING = object()
+
+
+def _record_key(record: dict[str, Any]) -> frozenset[Any]:
+    """Hashable cache key for a flat record such as the customer data.
+
+    Values are tagged with their type so 1, 1.0 and True don't share a key.
+    Raises TypeError if a value can't be hashed.
+    """
+    return frozenset((key, type(value), value) for key, value in record.items())
+
+
+# Message keywords for each routing category, matched as case-insensitive substrings
+ROUTING_KEYWORDS = {
+    "urgent": ["urgent", "emergency", "critical", "down", "broken"],
+    "technical": ["technical", "bug", "error", "not working", "crash"],
+    "billing": ["billing", "charge", "payment", "refund", "invoice"],
+}
+
+# Keywords behind the simplified sentiment score in _analyze_customer
+SENTIMENT_KEYWORDS = {
+    "negative": ["angry", "frustrated", "terrible", "awful"],
+    "pressing": ["urgent", "critical", "emergency"],
+}
+
+
+class KeywordClassifier:
+    """Find which keyword categories occur in a text with one regex pass.
+
+    Equivalent to testing ``keyword in text.lower()`` for every keyword.
+    """
+
+    def __init__(self, keywords: dict[str, list[str]]):
+        owners: dict[str, set] = {}
+        for category, words in keywords.items():
+            for word in words:
+                owners.setdefault(word.lower(), set()).add(category)
+        # Each position reports its longest keyword, so a match also counts
+        # for every keyword that is a prefix of it
+        self._labels = {
+            word: frozenset().union(
+                *(cats for other, cats in owners.items() if word.startswith(other))
+            )
+            for word in owners
+        }
+        alternatives = sorted(owners, key=len, reverse=True)
+        # A lookahead matches at every position, so overlapping keywords are found
+        self._pattern = re.compile(
+            "(?=(" + "|".join(map(re.escape, alternatives)) + "))"
+        )
+
+    def categories(self, text: str) -> frozenset[str]:
+        """Categories with at least one keyword in ``text``."""
+        found: frozenset[str] = frozenset()
+        for match in self._pattern.finditer(text.lower()):
+            found |= self._labels[match.group(1)]
+        return found
+
+
+# Routing and sentiment keywords are found together in one pass per message
+MESSAGE_CLASSIFIER = KeywordClassifier({**ROUTING_KEYWORDS, **SENTIMENT_KEYWORDS})
+
+
+# Escalation rule conditions and actions. Messages are classified once in
+# _analyze_customer, so conditions only check the "keyword_categories" set.
+def _is_urgent(fact: dict[str, Any]) -> bool:
+    return (
+        "urgent" in fact.get("keyword_categories", ())
+        or fact.get("sentiment_score", 0.5) < 0.2
+    )
+
+
+def _is_technical(fact: dict[str, Any]) -> bool:
+    return "technical" in fact.get("keyword_categories", ())
+
+
+def _is_billing(fact: dict[str, Any]) -> bool:
+    return "billing" in fact.get("keyword_categories", ())
+
+
+def _escalate_urgent(fact: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "escalate": True,
+        "escalation_level": "urgent",
+        "route_to": "supervisor",
+        "reason": "urgent_keywords_or_negative_sentiment",
+    }
+
+
+def _route_technical(fact: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "escalate": False,
+        "route_to": "technical_support",
+        "suggested_response": "technical_troubleshooting",
+    }
+
+
+def _route_billing(fact: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "escalate": False,
+        "route_to": "billing_team",
+        "suggested_response": "billing_assistance",
+    }
+
+
+def _route_general(fact: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "escalate": False,
+        "route_to": "general_support",
+        "suggested_response": "general_assistance",
+    }
+
+
+# Added at runtime by example_dynamic_rule_updates
+def _is_after_hours(fact: dict[str, Any]) -> bool:
+    hour = fact.get("current_hour", 12)
+    return hour < 9 or hour > 17
+
+
+def _route_after_hours(fact: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "escalate": True,
+        "route_to": "after_hours_team",
+        "message_prefix": "Thank you for contacting us after hours.",
+        "response_delay": "within_4_hours",
+    }
+
 
 class ConversationState(TypedDict):
-    """State for our LangGraph conversation agent."""
+    """State for our LangGraph conversation agent.
 
-    messages: List[BaseMessage]
-    customer_data: Dict[str, Any]
-    conversation_context: Dict[str, Any]
-    rule_results: List[Dict[str, Any]]
+    Nodes return only the keys they change. ``messages`` and
+    ``rule_results`` are appended to by LangGraph rather than replaced.
+    """
+
+    messages: Annotated[list[BaseMessage], operator.add]
+    customer_data: dict[str, Any]
+    conversation_context: dict[str, Any]
+    rule_results: Annotated[list[dict[str, Any]], operator.add]
     next_action: str
 
 
@@ -61,12 +206,23 @@ class RulesLangGraphAgent:
 
         self.admin = self.provider.get_rule_administrator()
         self.runtime = self.provider.get_rule_runtime()
+        self._rule_cache: OrderedDict[Any, Any] = OrderedDict()
 
         # Setup rules and workflow
         self._setup_customer_service_rules()
         self._setup_escalation_rules()
         self._setup_workflow()
 
+    def snapshot(self) -> dict[str, RuleExecutionSet]:
+        """Capture the agent's registered rule sets so they can be restored."""
+        registrations = self.admin.get_registrations()
+        return {uri: registrations[uri] for uri in ("customer_tiers", "escalation")}
+
+    def restore(self, snapshot: dict[str, RuleExecutionSet]):
+        """Re-register rule sets captured by ``snapshot``."""
+        for uri, execution_set in snapshot.items():
+            self.admin.register_rule_execution_set(uri, execution_set)
+
     def _setup_customer_service_rules(self):
         """Setup customer service routing and response rules."""
 
@@ -74,6 +230,7 @@ class RulesLangGraphAgent:
         tier_rules_yaml = """
 name: "customer_tier_rules"
 description: "Rules for classifying customer tiers and priorities"
+strategy: "FIRST_MATCH"
 rules:
   - name: "vip_customer"
     condition: >
@@ -116,112 +273,54 @@ rules:
     priority: 1
 """
 
-        # Create and register tier rules
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            f.write(tier_rules_yaml)
-            tier_path = f.name
-
-        try:
-            tier_execution_set = YAMLRuleLoader.from_file(tier_path)
-            self.admin.register_rule_execution_set("customer_tiers", tier_execution_set)
-        finally:
-            os.unlink(tier_path)
+        # Create and register tier rules straight from the YAML text
+        tier_execution_set = YAMLRuleLoader.from_stream(tier_rules_yaml)
+        self.admin.register_rule_execution_set("customer_tiers", tier_execution_set)
 
     def _setup_escalation_rules(self):
         """Setup escalation and routing rules."""
-
         escalation_rules = [
             Rule(
                 name="urgent_escalation",
-                condition=lambda fact: (
-                    any(
-                        keyword in fact.get("message", "").lower()
-                        for keyword in [
-                            "urgent",
-                            "emergency",
-                            "critical",
-                            "down",
-                            "broken",
-                        ]
-                    )
-                    or fact.get("sentiment_score", 0.5) < 0.2
-                ),
-                action=lambda fact: {
-                    "escalate": True,
-                    "escalation_level": "urgent",
-                    "route_to": "supervisor",
-                    "reason": "urgent_keywords_or_negative_sentiment",
-                },
+                condition=_is_urgent,
+                action=_escalate_urgent,
                 priority=100,
             ),
             Rule(
                 name="technical_issue",
-                condition=lambda fact: any(
-                    keyword in fact.get("message", "").lower()
-                    for keyword in ["technical", "bug", "error", "not working", "crash"]
-                ),
-                action=lambda fact: {
-                    "escalate": False,
-                    "route_to": "technical_support",
-                    "suggested_response": "technical_troubleshooting",
-                },
+                condition=_is_technical,
+                action=_route_technical,
                 priority=75,
             ),
             Rule(
                 name="billing_issue",
-                condition=lambda fact: any(
-                    keyword in fact.get("message", "").lower()
-                    for keyword in ["billing", "charge", "payment", "refund", "invoice"]
-                ),
-                action=lambda fact: {
-                    "escalate": False,
-                    "route_to": "billing_team",
-                    "suggested_response": "billing_assistance",
-                },
+                condition=_is_billing,
+                action=_route_billing,
                 priority=75,
             ),
             Rule(
                 name="general_inquiry",
                 condition=lambda fact: True,
-                action=lambda fact: {
-                    "escalate": False,
-                    "route_to": "general_support",
-                    "suggested_response": "general_assistance",
-                },
+                action=_route_general,
                 priority=1,
             ),
         ]
 
+        # Only the highest-priority routing decision is used, so stop there;
+        # within a priority the cheaper condition is tried first
         escalation_set = RuleExecutionSet(
-            name="escalation_rules", rules=escalation_rules
+            name="escalation_rules",
+            rules=escalation_rules,
+            properties={"strategy": "FIRST_MATCH"},
+            reorderable=True,
         )
         self.admin.register_rule_execution_set("escalation", escalation_set)
 
     def _setup_workflow(self):
-        """Setup the LangGraph workflow."""
-        workflow = StateGraph(ConversationState)
-
-        # Add nodes
-        workflow.add_node("analyze_customer", self._analyze_customer)
-        workflow.add_node("apply_tier_rules", self._apply_tier_rules)
-        workflow.add_node("apply_routing_rules", self._apply_routing_rules)
-        workflow.add_node("generate_response", self._generate_response)
-        workflow.add_node("escalate", self._escalate)
-
-        # Add edges (LangGraph v1 uses START instead of set_entry_point)
-        workflow.add_edge(START, "analyze_customer")
-        workflow.add_edge("analyze_customer", "apply_tier_rules")
-        workflow.add_edge("apply_tier_rules", "apply_routing_rules")
-        workflow.add_conditional_edges(
-            "apply_routing_rules",
-            self._should_escalate,
-        )
-        workflow.add_edge("generate_response", END)
-        workflow.add_edge("escalate", END)
-
-        self.workflow = workflow.compile()
+        """Use the process-wide compiled LangGraph workflow."""
+        self.workflow = _compiled_workflow()
 
-    def _analyze_customer(self, state: ConversationState) -> ConversationState:
+    def _analyze_customer(self, state: ConversationState) -> dict[str, Any]:
         """Analyze customer data and message context."""
         latest_message = state["messages"][-1]
 
@@ -237,77 +336,88 @@ rules:
             },
         )
 
+        # Classify the message once; rules and sentiment read the categories
+        message_text = str(latest_message.content)
+        categories = MESSAGE_CLASSIFIER.categories(message_text)
+
         # Analyze message sentiment (simplified - use proper sentiment analysis)
-        message_text = str(latest_message.content).lower()
         sentiment_score = 0.8  # Default positive
-        if any(
-            word in message_text
-            for word in ["angry", "frustrated", "terrible", "awful"]
-        ):
+        if "negative" in categories:
             sentiment_score = 0.2
-        elif any(word in message_text for word in ["urgent", "critical", "emergency"]):
+        elif "pressing" in categories:
             sentiment_score = 0.3
 
         conversation_context = {
-            "message": str(latest_message.content),
+            "message": message_text,
+            "keyword_categories": categories,
             "sentiment_score": sentiment_score,
-            "message_length": len(str(latest_message.content)),
+            "message_length": len(message_text),
             "is_first_message": len(state["messages"]) == 1,
         }
 
         return {
-            **state,
             "customer_data": customer_data,
             "conversation_context": conversation_context,
         }
 
-    def _apply_tier_rules(self, state: ConversationState) -> ConversationState:
-        """Apply customer tier classification rules."""
-        session = self.runtime.create_rule_session("customer_tiers")
-        session.add_facts([state["customer_data"]])
-        tier_results = session.execute()
-        session.close()
-
-        # Get the highest priority tier result
-        tier_info = (
-            tier_results[0]
-            if tier_results
-            else {"tier": "Standard", "priority": "standard"}
-        )
+    def _evaluate_first(self, uri: str, fact: dict[str, Any]) -> Any:
+        """Return the first matching rule's result, reusing it for repeated facts.
 
-        return {
-            **state,
-            "rule_results": [{"type": "tier_classification", "result": tier_info}],
+        Used for customer records, which repeat on every turn of a
+        conversation. The key includes the registered execution set itself,
+        so registering new rules under the URI invalidates earlier results.
+        Returned values are shared with the cache and must not be modified.
+        """
+        execution_set = self.admin.get_registrations().get(uri)
+        try:
+            key: Any = (execution_set, _record_key(fact))
+            cached = self._rule_cache.get(key, _MISSING)
+        except TypeError:
+            key, cached = None, _MISSING
+        if cached is not _MISSING:
+            self._rule_cache.move_to_end(key)
+            return cached
+
+        result = self.runtime.evaluate_first(uri, fact)
+
+        if key is not None:
+            self._rule_cache[key] = result
+            if len(self._rule_cache) > RULE_CACHE_SIZE:
+                self._rule_cache.popitem(last=False)
+        return result
+
+    def _apply_rules(self, state: ConversationState) -> dict[str, Any]:
+        """Apply customer tier classification, then routing and escalation rules.
+
+        Both rule sets run in one workflow step; routing rules don't depend on
+        the tier, so there is nothing to pass between them.
+        """
+        # Only the highest-priority result of each rule set is used
+        tier_info = self._evaluate_first("customer_tiers", state["customer_data"]) or {
+            "tier": "Standard",
+            "priority": "standard",
         }
 
-    def _apply_routing_rules(self, state: ConversationState) -> ConversationState:
-        """Apply routing and escalation rules."""
         # Combine customer data and conversation context for rule evaluation
         fact = {**state["customer_data"], **state["conversation_context"]}
 
-        session = self.runtime.create_rule_session("escalation")
-        session.add_facts([fact])
-        routing_results = session.execute()
-        session.close()
-
-        # Get the highest priority routing result
-        routing_info = (
-            routing_results[0]
-            if routing_results
-            else {"escalate": False, "route_to": "general_support"}
-        )
-
-        state["rule_results"].append(
-            {"type": "routing_decision", "result": routing_info}
-        )
+        # Not cached: the fact carries the raw message, so it rarely repeats
+        routing_info = self.runtime.evaluate_first("escalation", fact) or {
+            "escalate": False,
+            "route_to": "general_support",
+        }
 
         return {
-            **state,
+            "rule_results": [
+                {"type": "tier_classification", "result": tier_info},
+                {"type": "routing_decision", "result": routing_info},
+            ],
             "next_action": "escalate" if routing_info.get("escalate") else "respond",
         }
 
+    @staticmethod
     def _should_escalate(
-        self, state: ConversationState
+        state: ConversationState,
     ) -> Literal["escalate", "generate_response"]:
         """Conditional edge function to determine if escalation is needed."""
         action = state.get("next_action", "respond")
@@ -315,7 +425,7 @@ rules:
             return "escalate"
         return "generate_response"
 
-    def _generate_response(self, state: ConversationState) -> ConversationState:
+    def _generate_response(self, state: ConversationState) -> dict[str, Any]:
         """Generate an appropriate response based on rules results using LLM."""
         tier_result = next(
             (
@@ -367,14 +477,10 @@ Keep it concise (2-3 sentences) and appropriate for their tier level."""
         if tier == "VIP":
             response += " As a VIP customer, you'll receive priority assistance."
 
-        ai_message = AIMessage(content=response)
-
-        # Append to messages instead of replacing
-        new_messages = state["messages"] + [ai_message]
-
-        return {**state, "messages": new_messages}
+        # LangGraph appends this to the conversation's messages
+        return {"messages": [AIMessage(content=response)]}
 
-    def _escalate(self, state: ConversationState) -> ConversationState:
+    def _escalate(self, state: ConversationState) -> dict[str, Any]:
         """Handle escalation scenarios."""
         routing_result = next(
             (
@@ -395,16 +501,12 @@ Keep it concise (2-3 sentences) and appropriate for their tier level."""
             f"{reason})"
         )
 
-        ai_message = AIMessage(content=response)
-
-        # Append to messages instead of replacing
-        new_messages = state["messages"] + [ai_message]
-
-        return {**state, "messages": new_messages}
+        # LangGraph appends this to the conversation's messages
+        return {"messages": [AIMessage(content=response)]}
 
     def process_message(
-        self, message: str, customer_data: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
+        self, message: str, customer_data: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
         """Process a customer message through the rule-based workflow."""
         initial_state = ConversationState(
             messages=[HumanMessage(content=message)],
@@ -414,7 +516,10 @@ Keep it concise (2-3 sentences) and appropriate for their tier level."""
             next_action="",
         )
 
-        result = self.workflow.invoke(initial_state)
+        # Nodes find this agent through the run's config
+        result = self.workflow.invoke(
+            initial_state, config={"configurable": {"agent": self}}
+        )
 
         return {
             "response": result["messages"][-1].content,
@@ -438,12 +543,56 @@ Keep it concise (2-3 sentences) and appropriate for their tier level."""
         }
 
 
-def example_conversation_flow():
-    """Demonstrate the rules-based conversation agent."""
+def _agent_node(method_name: str):
+    """Build a graph node that runs ``method_name`` on the invoking agent."""
+
+    def node(state: ConversationState, config: RunnableConfig) -> dict[str, Any]:
+        agent = config["configurable"]["agent"]
+        return getattr(agent, method_name)(state)
+
+    node.__name__ = method_name
+    return node
+
+
+@functools.cache
+def _compiled_workflow():
+    """Build and compile the LangGraph workflow once per process.
+
+    Nodes look the agent up in the run's config instead of being bound to
+    one agent, so every agent shares the compiled graph.
+    """
+    workflow = StateGraph(ConversationState)
+
+    # Add nodes
+    workflow.add_node("analyze_customer", _agent_node("_analyze_customer"))
+    workflow.add_node("apply_rules", _agent_node("_apply_rules"))
+    workflow.add_node("generate_response", _agent_node("_generate_response"))
+    workflow.add_node("escalate", _agent_node("_escalate"))
+
+    # Add edges (LangGraph v1 uses START instead of set_entry_point)
+    workflow.add_edge(START, "analyze_customer")
+    workflow.add_edge("analyze_customer", "apply_rules")
+    workflow.add_conditional_edges(
+        "apply_rules",
+        RulesLangGraphAgent._should_escalate,
+    )
+    workflow.add_edge("generate_response", END)
+    workflow.add_edge("escalate", END)
+
+    return workflow.compile()
+
+
+def example_conversation_flow(
+    agent: RulesLangGraphAgent | None = None,
+) -> RulesLangGraphAgent:
+    """Demonstrate the rules-based conversation agent.
+
+    Returns the agent so later examples can reuse its compiled workflow.
+    """
     print("=== LangGraph + Machine Rules Agent Example ===\n")
 
-    # Create the agent
-    agent = RulesLangGraphAgent()
+    if agent is None:
+        agent = RulesLangGraphAgent()
 
     # Example customer scenarios
     scenarios = [
@@ -512,25 +661,26 @@ def example_conversation_flow():
         print(f"Routing Decision: {result['routing_decision']}")
         print("\n" + "=" * 60 + "\n")
 
+    return agent
 
-def example_dynamic_rule_updates():
-    """Demonstrate dynamic rule updates during conversation."""
+
+def example_dynamic_rule_updates(agent: RulesLangGraphAgent | None = None):
+    """Demonstrate dynamic rule updates during conversation.
+
+    The agent's original rules are restored afterwards, so a shared agent
+    can be passed in instead of building and compiling a new one.
+    """
     print("=== Dynamic Rule Updates Example ===\n")
 
-    agent = RulesLangGraphAgent()
+    if agent is None:
+        agent = RulesLangGraphAgent()
+    original_rules = agent.snapshot()
 
     # Add a new business hours rule dynamically
     business_hours_rule = Rule(
         name="after_hours_support",
-        condition=lambda fact: (
-            fact.get("current_hour", 12) < 9 or fact.get("current_hour", 12) > 17
-        ),
-        action=lambda fact: {
-            "escalate": True,
-            "route_to": "after_hours_team",
-            "message_prefix": "Thank you for contacting us after hours.",
-            "response_delay": "within_4_hours",
-        },
+        condition=_is_after_hours,
+        action=_route_after_hours,
         priority=90,
     )
 
@@ -538,8 +688,9 @@ def example_dynamic_rule_updates():
     session = agent.runtime.create_rule_session("escalation")
     existing_set = agent.admin.get_registrations()["escalation"]
 
-    updated_rules = list(existing_set.get_rules()) + [business_hours_rule]
-    updated_set = RuleExecutionSet(name="escalation_with_hours", rules=updated_rules)
+    updated_set = existing_set.with_rules(
+        business_hours_rule, name="escalation_with_hours"
+    )
 
     # Register updated rules
     agent.admin.register_rule_execution_set("escalation", updated_set)
@@ -555,12 +706,15 @@ def example_dynamic_rule_updates():
         "current_hour": 22,  # 10 PM
     }
 
-    result = agent.process_message(
-        "I need help with my account access", after_hours_scenario
-    )
+    try:
+        result = agent.process_message(
+            "I need help with my account access", after_hours_scenario
+        )
 
-    print(f"After-hours response: {result['response']}")
-    print(f"Routing: {result['routing_decision']}")
+        print(f"After-hours response: {result['response']}")
+        print(f"Routing: {result['routing_decision']}")
+    finally:
+        agent.restore(original_rules)
 
 
 if __name__ == "__main__":
@@ -570,8 +724,8 @@ if __name__ == "__main__":
     print("Make sure Ollama is running with: ollama pull gpt-oss:20b\n")
 
     try:
-        example_conversation_flow()
-        example_dynamic_rule_updates()
+        agent = example_conversation_flow()
+        example_dynamic_rule_updates(agent)
 
         print("\n=== All LangGraph Examples Completed Successfully ===")
 
@@ -1,26 +1,92 @@
 # machine_rules/__main__.py
+import re
+from collections.abc import Callable, Coroutine
+from typing import Any
+
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
 from pydantic import BaseModel
 
 # Import the main package to ensure initialization
 import machine_rules  # noqa: F401
+from machine_rules.api.exceptions import RuleValidationError
 from machine_rules.api.registry import RuleServiceProviderManager
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 class FactModel(BaseModel):
     facts: list
     ruleset_uri: str
 
 
-app = FastAPI()
+# orjson decodes integers outside the 64-bit range as floats; a run of 19
+# or more digits may be one, so such bodies are decoded by the stdlib
+_LONG_DIGITS = re.compile(rb"\d{19}")
+
+
+class ORJSONRequest(Request):
+    """Request whose JSON body is decoded with orjson."""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            body = await self.body()
+            if _LONG_DIGITS.search(body):
+                self._json = await super().json()
+            else:
+                self._json = orjson.loads(body)
+        return self._json
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Unlike fastapi.responses.ORJSONResponse (deprecated), this falls back
+    to the stdlib for content orjson rejects, such as integers outside the
+    64-bit range, since rendering happens after the endpoint has returned.
+    """
+
+    def render(self, content: Any) -> bytes:
+        try:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            return super().render(content)
+
+
+class ORJSONRoute(APIRoute):
+    """Route that hands its endpoint an ORJSONRequest.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so malformed
+    bodies are still reported by FastAPI as a 422 validation error.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def orjson_handler(request: Request) -> Response:
+            return await handler(ORJSONRequest(request.scope, request.receive))
+
+        return orjson_handler
+
+
+# Fact batches make /execute decode-heavy; use orjson when it is installed
+if ORJSON_AVAILABLE:
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.router.route_class = ORJSONRoute
+else:
+    app = FastAPI(default_response_class=JSONResponse)
 
 
 @app.post("/execute")
 def execute_rule_set(data: FactModel):
     try:
-        from machine_rules.api.exceptions import RuleValidationError
-
         provider = RuleServiceProviderManager.get("api")
         if not provider:
             detail = "No rule service provider registered for 'api'"
@@ -37,7 +103,7 @@ def execute_rule_set(data: FactModel):
     except (ValueError, RuleValidationError) as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        detail = f"Internal server error: {str(e)}"
+        detail = f"Internal server error: {e!s}"
         raise HTTPException(status_code=500, detail=detail)
 
 
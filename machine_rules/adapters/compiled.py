@@ -0,0 +1,128 @@
+"""
+Single-function FIRST_MATCH evaluation for rule sets loaded from expressions.
+
+When every rule in a set was built from source expressions (as the YAML
+loader does), the set can be compiled into one Python function: an
+``if`` chain over the condition expressions in priority order that calls
+the matching rule's action. Evaluating a fact is then one call instead of
+one call per rule tried.
+
+The expressions are validated by the loader's whitelist again before they
+are compiled, so a rule's ``_condition_expr`` can never reach ``exec``
+unchecked.
+"""
+
+import ast
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+from ..api.execution_set import Rule
+
+# Returned by compiled functions when no rule matches; a matching action
+# may itself return None
+NO_MATCH = object()
+
+# The compiled function's frame; rule blocks replace ``pass``
+_FUNCTION_SKELETON = """
+def _bind(_names, _on_condition_error, _actions, _no_match):
+    def first_match(fact, _errors):
+        pass
+        return _no_match
+    return first_match
+"""
+
+# One block per rule. An error from the inlined condition is reported as
+# the interpreted FIRST_MATCH loop would report it, without evaluating the
+# condition again. A raising action is recorded and the next rule is tried.
+_RULE_BLOCK = """
+try:
+    _matched = _condition
+except Exception as _error:
+    _matched = _on_condition_error[{index}](_error, _errors)
+if _matched:
+    try:
+        return _actions[{index}](fact)
+    except Exception as _error:
+        _errors.record(_names[{index}], _error)
+"""
+
+
+def _condition_error_handler(rule: Rule) -> Callable[[Exception, Any], Any]:
+    """Report a failed inlined condition and return whether the rule matches.
+
+    Loaded rules pass the error to their own handler, which logs it and
+    returns False. Other rules record it in the run's errors.
+    """
+    on_error = getattr(rule.condition, "_on_error", None)
+    if on_error is not None:
+        return lambda error, errors: on_error(error)
+    name = rule.name
+
+    def record(error: Exception, errors: Any) -> bool:
+        errors.record(name, error)
+        return False
+
+    return record
+
+
+def is_compilable(rules: Iterable[Rule]) -> bool:
+    """Whether every rule has both a condition and an action expression."""
+    return all(
+        isinstance(rule._condition_expr, str) and isinstance(rule._action_expr, str)
+        for rule in rules
+    )
+
+
+def compile_first_match(rules: Sequence[Rule]) -> Callable[[Any, Any], Any] | None:
+    """Compile rules, in priority order, into a function of one fact.
+
+    The function takes the fact and a ``_RuleErrors`` to record rule errors
+    in, and returns the first matching rule's action result, or
+    ``NO_MATCH``. Returns None unless every rule has both a condition and
+    an action expression, or if any expression fails validation.
+    """
+    if not rules or not is_compilable(rules):
+        return None
+
+    # Imported here so the engine does not load yaml and pydantic up front
+    from ..api.exceptions import RuleValidationError
+    from ..loader.yaml_loader import (
+        _GUARD_GLOBALS,
+        SAFE_GLOBALS,
+        _compile_expression,
+        _guard_operators,
+    )
+
+    blocks = []
+    for index, rule in enumerate(rules):
+        src = rule._condition_expr
+        assert src is not None
+        try:
+            _compile_expression(src)
+        except RuleValidationError:
+            return None
+        block = ast.parse(_RULE_BLOCK.format(index=index)).body
+        guarded = block[0]
+        assert isinstance(guarded, ast.Try)
+        matched = guarded.body[0]
+        assert isinstance(matched, ast.Assign)
+        matched.value = _guard_operators(ast.parse(src.strip(), mode="eval").body)
+        blocks.extend(block)
+
+    module = ast.parse(_FUNCTION_SKELETON)
+    bind = module.body[0]
+    assert isinstance(bind, ast.FunctionDef)
+    first_match = bind.body[0]
+    assert isinstance(first_match, ast.FunctionDef)
+    first_match.body[:1] = blocks
+    ast.fix_missing_locations(module)
+
+    namespace = dict(SAFE_GLOBALS, Exception=Exception, **_GUARD_GLOBALS)
+    # Conditions passed _compile_expression above; the rest is the fixed skeleton
+    exec(compile(module, "<rules>", "exec"), namespace)  # noqa: S102
+    return namespace["_bind"](
+        tuple(rule.name for rule in rules),
+        tuple(_condition_error_handler(rule) for rule in rules),
+        tuple(rule.action for rule in rules),
+        NO_MATCH,
+    )
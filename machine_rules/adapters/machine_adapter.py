@@ -1,15 +1,280 @@
 import logging
+import sys
 import threading
-from typing import Dict, Any, List, Optional
+from collections import Counter
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
 from ..api.administrator import RuleAdministrator
+from ..api.exceptions import RuleValidationError, SessionError
+from ..api.execution_set import Rule, RuleExecutionSet, _AlphaIndex
+from ..api.registry import RuleServiceProvider
 from ..api.runtime import RuleRuntime
 from ..api.session import RuleSession
-from ..api.execution_set import RuleExecutionSet
-from ..api.registry import RuleServiceProvider
-from ..api.exceptions import SessionError, RuleValidationError
+from .compiled import NO_MATCH, compile_first_match, is_compilable
+from .numba_dispatch import EqualityDispatch
+from .vectorized import MIN_BATCH_SIZE, VectorizedRules
 
 logger = logging.getLogger(__name__)
 
+_MSG_CLOSED = "Session is closed"
+_MSG_BAD_FACTS = "Facts must be a list"
+_MSG_BAD_WORKERS = "n_workers must be a positive integer"
+
+# Session lifecycle states, compared by identity
+_OPEN = object()
+_CLOSED = object()
+
+
+class _RuleErrors:
+    """Aggregates rule errors raised during one execute() call.
+
+    Only the first exception is kept (for its traceback); later ones are
+    reduced to per-(rule, exception type) counts.
+    """
+
+    __slots__ = ("counts", "first")
+
+    def __init__(self):
+        # Both stay None until the first error, so clean runs allocate nothing
+        self.first: tuple[str, Exception] | None = None
+        self.counts: Counter | None = None
+
+    def record(self, rule_name: str, exc: Exception):
+        if self.counts is None:
+            self.counts = Counter()
+            self.first = (rule_name, exc)
+        self.counts[(rule_name, type(exc).__name__)] += 1
+
+    def merge(self, other: "_RuleErrors"):
+        """Fold in errors recorded by a later batch of the same run."""
+        if other.counts is None:
+            return
+        if self.counts is None:
+            self.counts = Counter()
+            self.first = other.first
+        self.counts.update(other.counts)
+
+    def log(self):
+        """Log the recorded errors as a single record, if there were any."""
+        counts = self.counts
+        if counts is None or self.first is None:
+            return
+        rule_name, exc = self.first
+        message = f"Error executing rule {rule_name}: {exc}"
+        total = sum(counts.values())
+        if total > 1:
+            breakdown = ", ".join(
+                f"{name} ({exc_type}) x{count}"
+                for (name, exc_type), count in counts.most_common()
+            )
+            message += f" [{total} rule errors in this execution: {breakdown}]"
+        logger.error(
+            message,
+            exc_info=exc,
+            extra={
+                "error_counts": {
+                    f"{name}:{exc_type}": count
+                    for (name, exc_type), count in counts.items()
+                }
+            },
+        )
+
+
+def _execute_all_matches(
+    rules: Sequence[Rule],
+    facts: list[Any],
+    unconditional: bool,
+    results: list[Any],
+    errors: _RuleErrors,
+):
+    """Fire every matching rule for every fact, appending non-None results.
+
+    The execution kernels only touch their arguments and locals; failures are
+    recorded in ``errors`` rather than raised so one bad rule never aborts a run.
+    """
+    append = results.append
+    for fact in facts:
+        for rule in rules:
+            try:
+                if unconditional or rule.condition(fact):
+                    result = rule.action(fact)
+                    if result is not None:
+                        append(result)
+            except Exception as e:  # noqa: BLE001
+                errors.record(rule.name, e)
+
+
+def _execute_indexed(
+    rules: Sequence[Rule],
+    alpha_index: _AlphaIndex,
+    facts: list[Any],
+    results: list[Any],
+    errors: _RuleErrors,
+):
+    """Fire every matching rule, running conditions only for alpha-index candidates.
+
+    Dict facts are prefiltered through the index, and candidates whose
+    condition is exactly the indexed equality test match without being
+    called. Any other fact falls back to scanning every rule, since its
+    ``get`` may not behave like a dict's.
+    """
+    append = results.append
+    candidates = alpha_index.candidates
+    exact = alpha_index.exact
+    every_rule = range(len(rules))
+    never = [False] * len(rules)
+    for fact in facts:
+        indexes: Sequence[int]
+        if type(fact) is dict:
+            indexes, hashed = candidates(fact)
+            skip = exact if hashed else never
+        else:
+            indexes, skip = every_rule, never
+        for index in indexes:
+            rule = rules[index]
+            try:
+                if skip[index] or rule.condition(fact):
+                    result = rule.action(fact)
+                    if result is not None:
+                        append(result)
+            except Exception as e:  # noqa: BLE001
+                errors.record(rule.name, e)
+
+
+def _execute_first_match(
+    execution_set: RuleExecutionSet,
+    facts: list[Any],
+    unconditional: bool,
+    results: list[Any],
+    errors: _RuleErrors,
+):
+    """Fire only the highest-priority matching rule for every fact.
+
+    Rules are walked lazily so the tail of a large, partially sorted
+    execution set is only sorted when the head has no match.
+    """
+    append = results.append
+    iter_rules = execution_set.iter_rules
+    for fact in facts:
+        for rule in iter_rules():
+            try:
+                if unconditional or rule.condition(fact):
+                    result = rule.action(fact)
+                    if result is not None:
+                        append(result)
+                    break
+            except Exception as e:  # noqa: BLE001
+                errors.record(rule.name, e)
+
+
+def _execute_compiled_first_match(
+    first_match: Callable[[Any, _RuleErrors], Any],
+    facts: list[Any],
+    results: list[Any],
+    errors: _RuleErrors,
+):
+    """Fire only the highest-priority matching rule for every fact, via one call.
+
+    ``first_match`` comes from ``compile_first_match`` and records rule
+    errors in ``errors`` itself.
+    """
+    append = results.append
+    for fact in facts:
+        result = first_match(fact, errors)
+        if result is not None and result is not NO_MATCH:
+            append(result)
+
+
+def _freeze(value: Any) -> Any:
+    """Convert a fact into a hashable key, or raise TypeError if it can't be.
+
+    Leaves are tagged with their type so values that compare equal across
+    types (``1``, ``1.0`` and ``True``) don't share a memoized result.
+    """
+    if isinstance(value, dict):
+        return frozenset((_freeze(k), _freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_freeze(v) for v in value))
+    if isinstance(value, (set, frozenset)):
+        return (type(value), frozenset(_freeze(v) for v in value))
+    hash(value)
+    return (type(value), value)
+
+
+def _execute_memoized(
+    rules: Sequence[Rule],
+    condition_keys: Sequence[Any],
+    facts: list[Any],
+    first_match: bool,
+    results: list[Any],
+    errors: _RuleErrors,
+):
+    """Execute rules, reusing condition results for facts that compare equal.
+
+    Results are cached per structural condition key, so rules that repeat
+    an equivalent condition share one evaluation per distinct fact. Facts
+    that can't be frozen into a hashable key are evaluated normally.
+    """
+    append = results.append
+    cache: dict[tuple[Any, Any], bool] = {}
+    for fact in facts:
+        try:
+            key = _freeze(fact)
+        except TypeError:
+            key = None
+        for rule, condition_key in zip(rules, condition_keys):
+            try:
+                if key is None:
+                    matched = bool(rule.condition(fact))
+                elif (condition_key, key) in cache:
+                    matched = cache[(condition_key, key)]
+                else:
+                    matched = cache[(condition_key, key)] = bool(rule.condition(fact))
+                if matched:
+                    result = rule.action(fact)
+                    if result is not None:
+                        append(result)
+                    if first_match:
+                        break
+            except Exception as e:  # noqa: BLE001
+                errors.record(rule.name, e)
+
+
+def _vectorized_rules(
+    execution_set: RuleExecutionSet,
+) -> EqualityDispatch | VectorizedRules | None:
+    """Get the execution set's batch evaluator, compiling it on first use.
+
+    Sets that route on one integer field use the numba dispatch kernel;
+    other numeric sets use NumPy array programs. Either may be unavailable.
+    """
+    if not execution_set._vectorized_built:
+        rules = execution_set.get_rules()
+        execution_set._vectorized = EqualityDispatch.compile(
+            rules
+        ) or VectorizedRules.compile(rules)
+        execution_set._vectorized_built = True
+    return execution_set._vectorized
+
+
+def _compiled_first_match(
+    execution_set: RuleExecutionSet,
+) -> Callable[[Any, _RuleErrors], Any] | None:
+    """Get the execution set's compiled FIRST_MATCH function, building it on first use.
+
+    Only sets whose rules were all loaded from expressions can be compiled.
+    Other sets are rejected before the rules are fully sorted, so FIRST_MATCH
+    can still stop in the head of a partially sorted set.
+    """
+    if not execution_set._first_match_built:
+        head, tail = execution_set._head, execution_set._tail
+        if is_compilable(head) and is_compilable(tail):
+            execution_set._first_match = compile_first_match(execution_set.get_rules())
+        execution_set._first_match_built = True
+    return execution_set._first_match
+
 
 class MachineRuleSession(RuleSession):
     """
@@ -22,20 +287,26 @@ class MachineRuleSession(RuleSession):
 
     def __init__(self, execution_set: RuleExecutionSet, stateless: bool = False):
         self.execution_set = execution_set
-        self.facts: List[Any] = []
-        self.results: List[Any] = []
-        self._closed = False
+        self.facts: list[Any] = []
+        self.results: list[Any] = []
+        # Fact fields packed into arrays by the vectorized path; only valid
+        # until the facts change
+        self._columns: dict[Any, Any] = {}
+        self._state = _OPEN
         self.stateless = stateless
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_workers = 0
 
-    def add_facts(self, facts: List[Any]):
+    def add_facts(self, facts: list[Any]):
         """Add facts to the session."""
-        if self._closed:
-            raise SessionError("Session is closed")
+        if self._state is _CLOSED:
+            raise SessionError(_MSG_CLOSED)
         if not isinstance(facts, list):
-            raise RuleValidationError("Facts must be a list")
+            raise RuleValidationError(_MSG_BAD_FACTS)
         self.facts.extend(facts)
+        self._columns.clear()
 
-    def execute(self) -> List[Any]:
+    def execute(self, n_workers: int = 1) -> list[Any]:
         """Execute rules and return results.
 
         Execution strategy can be configured via execution_set properties:
@@ -43,49 +314,164 @@ class MachineRuleSession(RuleSession):
         - 'FIRST_MATCH': Stop after first matching rule per fact (short-circuit)
 
         If stateless=True, facts are automatically cleared after execution.
+
+        Args:
+            n_workers: Number of threads to split the facts across. Results
+                are returned in the same order as with the default of 1.
         """
-        if self._closed:
-            raise SessionError("Session is closed")
+        if self._state is _CLOSED:
+            raise SessionError(_MSG_CLOSED)
+        if type(n_workers) is not int or n_workers < 1:
+            raise RuleValidationError(_MSG_BAD_WORKERS)
+
+        # Zero-fact fast path: with no facts (or no rules) nothing can fire.
+        # The head is only empty for an empty set, and checking it never
+        # forces the lazy sort of the tail.
+        if not self.facts or not self.execution_set._head:
+            self.results.clear()
+            if self.stateless:
+                self.facts.clear()
+                self._columns.clear()
+            return []
 
         # Get execution strategy from properties (default to ALL_MATCHES)
-        strategy = self.execution_set.get_properties().get("strategy", "ALL_MATCHES")
-
-        self.results = []
-        for fact in self.facts:
-            for rule in self.execution_set.get_rules():
-                try:
-                    if rule.condition(fact):
-                        result = rule.action(fact)
-                        if result is not None:
-                            self.results.append(result)
-
-                        # If FIRST_MATCH strategy, stop after first match per fact
-                        if strategy == "FIRST_MATCH":
-                            break
-                except Exception as e:
-                    # Log error and continue with next rule
-                    logger.error(
-                        f"Error executing rule {rule.name}: {e}", exc_info=True
-                    )
+        strategy = self.execution_set.properties.get("strategy", "ALL_MATCHES")
+
+        unconditional = self.execution_set._unconditional
+
+        # Reuse the results buffer; callers only ever receive a copy of it
+        results = self.results
+        results.clear()
+        # Rule errors are aggregated and logged once after the run
+        errors = _RuleErrors()
+        if n_workers > 1 and len(self.facts) > 1:
+            self._run_parallel(n_workers, strategy, unconditional, results, errors)
+        else:
+            self._run(
+                self.facts, strategy, unconditional, results, errors, self._columns
+            )
+        errors.log()
 
         # Clear facts if stateless mode
         if self.stateless:
             self.facts.clear()
+            self._columns.clear()
 
-        return self.results.copy()
+        return results.copy()
+
+    def _run(
+        self,
+        facts: list[Any],
+        strategy: str,
+        unconditional: bool,
+        results: list[Any],
+        errors: _RuleErrors,
+        columns: dict[Any, Any] | None = None,
+    ):
+        """Run the execution kernel best suited to the set and the given facts.
+
+        ``columns`` is a cache of packed fact fields, only passed when it
+        belongs to exactly these facts.
+        """
+        execution_set = self.execution_set
+        first_match = strategy == "FIRST_MATCH"
+
+        if execution_set.vectorize and not first_match and len(facts) >= MIN_BATCH_SIZE:
+            vectorized = _vectorized_rules(execution_set)
+            if vectorized is not None and vectorized.execute(
+                facts, results, errors, columns
+            ):
+                return
+        if execution_set.memoize and not unconditional:
+            _execute_memoized(
+                execution_set.get_rules(),
+                execution_set.condition_keys,
+                facts,
+                first_match,
+                results,
+                errors,
+            )
+        elif first_match:
+            compiled = _compiled_first_match(execution_set)
+            if compiled is not None:
+                _execute_compiled_first_match(compiled, facts, results, errors)
+            else:
+                _execute_first_match(
+                    execution_set, facts, unconditional, results, errors
+                )
+        elif not unconditional and execution_set.alpha_index is not None:
+            _execute_indexed(
+                execution_set.get_rules(),
+                execution_set.alpha_index,
+                facts,
+                results,
+                errors,
+            )
+        else:
+            _execute_all_matches(
+                execution_set.get_rules(), facts, unconditional, results, errors
+            )
+
+    def _run_batch(
+        self, facts: list[Any], strategy: str, unconditional: bool
+    ) -> tuple[list[Any], _RuleErrors]:
+        """Run one worker's slice of the facts into its own buffers."""
+        results: list[Any] = []
+        errors = _RuleErrors()
+        self._run(facts, strategy, unconditional, results, errors)
+        return results, errors
+
+    def _run_parallel(
+        self,
+        n_workers: int,
+        strategy: str,
+        unconditional: bool,
+        results: list[Any],
+        errors: _RuleErrors,
+    ):
+        """Split the facts into contiguous batches and run them on a thread pool.
+
+        Batch outputs are gathered in fact order, so results and the first
+        recorded error match a sequential run.
+        """
+        executor = self._executor
+        if executor is None or self._executor_workers != n_workers:
+            if executor is not None:
+                executor.shutdown(wait=False)
+            executor = self._executor = ThreadPoolExecutor(max_workers=n_workers)
+            self._executor_workers = n_workers
+        facts = self.facts
+        size = -(-len(facts) // n_workers)
+        futures = [
+            executor.submit(
+                self._run_batch, facts[start : start + size], strategy, unconditional
+            )
+            for start in range(0, len(facts), size)
+        ]
+        for future in futures:
+            batch_results, batch_errors = future.result()
+            results.extend(batch_results)
+            errors.merge(batch_errors)
 
     def close(self):
         """Close the session and release resources."""
+        if self._state is _CLOSED:
+            return
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
         self.facts.clear()
         self.results.clear()
-        self._closed = True
+        self._columns.clear()
+        self._state = _CLOSED
 
     def reset(self):
         """Reset the session state."""
-        if self._closed:
-            raise SessionError("Session is closed")
+        if self._state is _CLOSED:
+            raise SessionError(_MSG_CLOSED)
         self.facts.clear()
         self.results.clear()
+        self._columns.clear()
 
 
 class MachineRuleAdministrator(RuleAdministrator):
@@ -104,7 +490,7 @@ class MachineRuleAdministrator(RuleAdministrator):
         self,
         name: str,
         execution_set: RuleExecutionSet,
-        properties: Optional[Dict[str, Any]] = None,
+        properties: dict[str, Any] | None = None,
     ):
         """Register a RuleExecutionSet with the administrator.
 
@@ -119,10 +505,10 @@ class MachineRuleAdministrator(RuleAdministrator):
                 f"execution_set must be a RuleExecutionSet instance, got {type(execution_set).__name__}"
             )
         with self._lock:
-            self.registrations[name] = execution_set
+            self.registrations[sys.intern(name)] = execution_set
 
     def deregister_rule_execution_set(
-        self, name: str, properties: Optional[Dict[str, Any]] = None
+        self, name: str, properties: dict[str, Any] | None = None
     ):
         """Remove a RuleExecutionSet registration.
 
@@ -133,7 +519,7 @@ class MachineRuleAdministrator(RuleAdministrator):
         with self._lock:
             self.registrations.pop(name, None)
 
-    def get_registrations(self) -> Dict[str, RuleExecutionSet]:
+    def get_registrations(self) -> dict[str, RuleExecutionSet]:
         """Get all registered RuleExecutionSets.
 
         Thread-safe: Can be called concurrently from multiple threads.
@@ -153,7 +539,7 @@ class MachineRuleRuntime(RuleRuntime):
     def create_rule_session(
         self,
         uri: str,
-        properties: Optional[Dict[str, Any]] = None,
+        properties: dict[str, Any] | None = None,
         stateless: bool = False,
     ) -> RuleSession:
         """Create a rule session for executing rules.
@@ -169,9 +555,41 @@ class MachineRuleRuntime(RuleRuntime):
         if not execution_set:
             msg = f"No rule execution set registered for URI: {uri}"
             raise RuleValidationError(msg)
+
         return MachineRuleSession(execution_set, stateless=stateless)
 
-    def get_registrations(self) -> List[str]:
+    def evaluate_first(self, uri: str, fact: Any) -> Any:
+        """Evaluate one fact without a session and return the first match's result.
+
+        Rules are tried in priority order, as with the FIRST_MATCH strategy,
+        whatever strategy the set is registered with. Returns None when no
+        rule matches or the matching action returns None. Rule errors are
+        logged and skipped, as in ``execute()``.
+
+        Args:
+            uri: The URI of the registered rule execution set
+            fact: The fact to evaluate
+        """
+        execution_set = self.administrator.registrations.get(uri)
+        if not execution_set:
+            msg = f"No rule execution set registered for URI: {uri}"
+            raise RuleValidationError(msg)
+
+        errors = _RuleErrors()
+        compiled = _compiled_first_match(execution_set)
+        if compiled is not None:
+            result = compiled(fact, errors)
+            errors.log()
+            return None if result is NO_MATCH else result
+
+        results: list[Any] = []
+        _execute_first_match(
+            execution_set, [fact], execution_set._unconditional, results, errors
+        )
+        errors.log()
+        return results[0] if results else None
+
+    def get_registrations(self) -> list[str]:
         """Get URIs of all registered rule execution sets."""
         return list(self.administrator.registrations.keys())
 
@@ -0,0 +1,161 @@
+"""
+Numba-compiled dispatch for rule sets that route facts on one integer field.
+
+When every rule requires ``fact.get(key, default) == <int constant>`` for the
+same key, a single jitted kernel matches a whole batch of facts against the
+packed constants and returns the (fact, rule) candidate pairs. Candidate
+conditions and actions then run in Python, in the usual order, so the kernel
+is a prefilter and never changes results.
+
+This module is optional: it requires numba (``pip install machine-rules[numba]``).
+numba is only imported when a rule set is first compiled for dispatch, so
+importing the engine does not pay its start-up cost.
+"""
+
+import functools
+import importlib.util
+from collections.abc import Sequence
+from typing import Any, Optional
+
+from ..api.execution_set import Rule, _discriminator
+
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+
+def _is_int64(value: Any) -> bool:
+    return type(value) in (int, bool) and _INT64_MIN <= value <= _INT64_MAX
+
+
+@functools.cache
+def _kernels() -> tuple[Any, Any]:
+    """Import numba and compile the dispatch kernels, once per process."""
+    import numpy as np
+    from numba import njit, prange  # type: ignore[import-untyped]
+
+    @njit(parallel=True)
+    def count_matches(values, consts):
+        counts = np.zeros(values.shape[0], dtype=np.int64)
+        for i in prange(values.shape[0]):
+            count = 0
+            for j in range(consts.shape[0]):
+                if consts[j] == values[i]:
+                    count += 1
+            counts[i] = count
+        return counts
+
+    @njit(parallel=True)
+    def fill_matches(values, consts, offsets, rule_indexes):
+        for i in prange(values.shape[0]):
+            k = offsets[i]
+            for j in range(consts.shape[0]):
+                if consts[j] == values[i]:
+                    rule_indexes[k] = j
+                    k += 1
+
+    return count_matches, fill_matches
+
+
+class EqualityDispatch:
+    """A rule set's integer equality tests, packed for the dispatch kernel."""
+
+    __slots__ = ("consts", "key", "missing", "rules")
+
+    def __init__(self, rules: Sequence[Rule], key: Any, missing: int, consts: Any):
+        self.rules = rules
+        self.key = key
+        self.missing = missing
+        self.consts = consts
+
+    @classmethod
+    def compile(cls, rules: Sequence[Rule]) -> Optional["EqualityDispatch"]:
+        """Pack the rules' equality constants, or return None if they aren't homogeneous."""
+        if not NUMBA_AVAILABLE or not rules:
+            return None
+        found = [_discriminator(rule) for rule in rules]
+        if any(test is None for test in found):
+            return None
+        tests = [test for test in found if test is not None]
+        if len({(key, default) for key, default, _ in tests}) != 1:
+            return None
+        key, default, _ = tests[0]
+        values = [value for _, _, value in tests]
+        if not all(_is_int64(value) for value in values):
+            return None
+
+        # Facts without the key compare as the default; a non-integer default
+        # that matches no constant is replaced by an integer that matches none
+        if _is_int64(default):
+            missing = default
+        elif any(default == value for value in values):
+            return None
+        elif min(values) > _INT64_MIN:
+            missing = min(values) - 1
+        else:
+            missing = max(values) + 1
+
+        import numpy as np
+
+        return cls(rules, key, missing, np.asarray(values, dtype=np.int64))
+
+    def _pack(self, facts: list[Any]) -> Any | None:
+        """Pack the routing field into an int64 array, or None if it isn't integral."""
+        import numpy as np
+
+        if not all(type(fact) is dict for fact in facts):
+            return None
+        key, missing = self.key, self.missing
+        raw = [fact.get(key, missing) for fact in facts]
+        if not all(_is_int64(value) for value in raw):
+            return None
+        return np.asarray(raw, dtype=np.int64)
+
+    def execute(
+        self,
+        facts: list[Any],
+        results: list[Any],
+        errors,
+        columns: dict[Any, Any] | None = None,
+    ) -> bool:
+        """Fire matching rules for a batch of dict facts.
+
+        Returns False without running anything if the routing field isn't an
+        integer in every fact, in which case the caller should fall back.
+        ``columns`` caches the packed routing field (None if it isn't
+        integral) across calls for the same, unchanged facts.
+        """
+        if columns is None:
+            columns = {}
+        cache_key = (self.key, self.missing)
+        if cache_key in columns:
+            values = columns[cache_key]
+        else:
+            values = columns[cache_key] = self._pack(facts)
+        if values is None:
+            return False
+
+        import numpy as np
+
+        count_matches, fill_matches = _kernels()
+        counts = count_matches(values, self.consts)
+        offsets = np.zeros(len(facts), dtype=np.int64)
+        np.cumsum(counts[:-1], out=offsets[1:])
+        rule_indexes = np.empty(int(counts.sum()), dtype=np.int64)
+        fill_matches(values, self.consts, offsets, rule_indexes)
+        fact_indexes = np.repeat(np.arange(len(facts)), counts)
+
+        append = results.append
+        rules = self.rules
+        for fact_index, rule_index in zip(fact_indexes.tolist(), rule_indexes.tolist()):
+            rule = rules[rule_index]
+            fact = facts[fact_index]
+            try:
+                if rule.condition(fact):
+                    result = rule.action(fact)
+                    if result is not None:
+                        append(result)
+            except Exception as e:  # noqa: BLE001
+                errors.record(rule.name, e)
+        return True
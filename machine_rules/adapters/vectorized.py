@@ -0,0 +1,247 @@
+"""
+NumPy-backed batch evaluation of numeric rule conditions.
+
+Conditions that only compare numeric fact fields against numeric constants,
+optionally combined with ``and``/``or``/``not``, are translated into
+array expressions. A batch of dict facts is then packed into one column per
+referenced field and each condition is evaluated for the whole batch at once.
+
+This module is optional: it requires numpy (``pip install machine-rules[numpy]``).
+"""
+
+import ast
+import operator
+from collections.abc import Callable, Sequence
+from typing import Any, Optional
+
+from ..api.execution_set import Rule
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Batches smaller than this are cheaper to evaluate fact by fact
+MIN_BATCH_SIZE = 64
+
+# Integers beyond this lose precision when a column is promoted to float64
+_EXACT_FLOAT_INT = 2**53
+
+_ColumnKey = tuple[str, Any]
+_Columns = dict[_ColumnKey, Any]
+_Program = Callable[[_Columns], Any]
+
+_OPERATORS: dict[Any, Callable[[Any, Any], Any]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+
+# Rule.cmp operator symbols, as AST comparison nodes
+_SYMBOLS: dict[str, Any] = {
+    "==": ast.Eq,
+    "!=": ast.NotEq,
+    "<": ast.Lt,
+    "<=": ast.LtE,
+    ">": ast.Gt,
+    ">=": ast.GtE,
+}
+
+
+def _is_number(value: Any) -> bool:
+    return type(value) in (int, float, bool) and (
+        type(value) is float or -_EXACT_FLOAT_INT < value < _EXACT_FLOAT_INT
+    )
+
+
+class _Unsupported(Exception):
+    """Raised internally when a condition can't be vectorized."""
+
+
+def _constant(node: ast.AST) -> Any:
+    """Return the numeric value of a literal such as ``5`` or ``-2.5``."""
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        value = _constant(node.operand)
+        return -value if isinstance(node.op, ast.USub) else value
+    if isinstance(node, ast.Constant) and _is_number(node.value):
+        return node.value
+    raise _Unsupported
+
+
+def _operand(node: ast.AST, keys: set[_ColumnKey]) -> _Program:
+    """Translate ``fact.get('key', default)`` or a numeric literal."""
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and node.func.attr == "get"
+        and isinstance(node.func.value, ast.Name)
+        and node.func.value.id == "fact"
+        and not node.keywords
+        and len(node.args) == 2
+        and isinstance(node.args[0], ast.Constant)
+        and isinstance(node.args[0].value, str)
+    ):
+        key = (node.args[0].value, _constant(node.args[1]))
+        keys.add(key)
+        return lambda columns: columns[key]
+    value = _constant(node)
+    return lambda columns: value
+
+
+def _translate(node: ast.AST, keys: set[_ColumnKey]) -> _Program:
+    """Translate a condition AST into a function of the batch columns."""
+    if isinstance(node, ast.BoolOp):
+        parts = [_translate(value, keys) for value in node.values]
+        reduce = (
+            np.logical_and.reduce
+            if isinstance(node.op, ast.And)
+            else np.logical_or.reduce
+        )
+        return lambda columns: reduce([part(columns) for part in parts])
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        inner = _translate(node.operand, keys)
+        return lambda columns: np.logical_not(inner(columns))
+    if isinstance(node, ast.Compare):
+        operands = [_operand(node.left, keys)]
+        operands += [_operand(c, keys) for c in node.comparators]
+        pairs = []
+        for i, op in enumerate(node.ops):
+            compare = _OPERATORS.get(type(op))
+            if compare is None:
+                raise _Unsupported
+            pairs.append((compare, operands[i], operands[i + 1]))
+        # Chains such as ``0 < x <= 10`` are a conjunction of their pairs
+        return lambda columns: np.logical_and.reduce(
+            [compare(left(columns), right(columns)) for compare, left, right in pairs]
+        )
+    raise _Unsupported
+
+
+def _compile_condition(rule: Rule, keys: set[_ColumnKey]) -> _Program | None:
+    """Translate a rule's condition, or return None if it isn't numeric-only."""
+    comparison = getattr(rule.condition, "_comparison", None)
+    try:
+        if comparison is not None:
+            key, op, const, default = comparison
+            if not (isinstance(key, str) and _is_number(const)):
+                return None
+            tree: ast.AST = ast.Compare(
+                left=ast.Call(
+                    func=ast.Attribute(value=ast.Name(id="fact"), attr="get"),
+                    args=[ast.Constant(key), ast.Constant(default)],
+                    keywords=[],
+                ),
+                ops=[_SYMBOLS[op]()],
+                comparators=[ast.Constant(const)],
+            )
+        else:
+            src = getattr(rule, "_condition_expr", None)
+            if not isinstance(src, str):
+                return None
+            tree = ast.parse(src.strip(), mode="eval").body
+        rule_keys: set[_ColumnKey] = set()
+        program = _translate(tree, rule_keys)
+    except (_Unsupported, SyntaxError):
+        return None
+    keys |= rule_keys
+    return program
+
+
+def _column(facts: list[dict[str, Any]], key: str, default: Any) -> Any | None:
+    """Pack one field of every fact into a numeric array, or None if it isn't numeric."""
+    values = [fact.get(key, default) for fact in facts]
+    try:
+        column = np.asarray(values)
+    except (TypeError, ValueError):
+        return None
+    if column.ndim != 1 or column.dtype.kind not in "biuf":
+        return None
+    if column.dtype.kind == "f" and not all(_is_number(v) for v in values):
+        # Ints too large for float64 would compare inexactly once promoted
+        return None
+    return column
+
+
+class VectorizedRules:
+    """Numeric rule conditions compiled for batch evaluation.
+
+    Only built when every rule's condition can be vectorized, so results
+    come out in exactly the order of the per-fact loop.
+    """
+
+    __slots__ = ("keys", "programs", "rules")
+
+    def __init__(
+        self, rules: Sequence[Rule], programs: list[_Program], keys: set[_ColumnKey]
+    ):
+        self.rules = rules
+        self.programs = programs
+        self.keys = keys
+
+    @classmethod
+    def compile(cls, rules: Sequence[Rule]) -> Optional["VectorizedRules"]:
+        """Compile rules for batch evaluation, or return None if any can't be."""
+        if not NUMPY_AVAILABLE or not rules:
+            return None
+        keys: set[_ColumnKey] = set()
+        programs = []
+        for rule in rules:
+            program = _compile_condition(rule, keys)
+            if program is None:
+                return None
+            programs.append(program)
+        return cls(rules, programs, keys)
+
+    def execute(
+        self,
+        facts: list[Any],
+        results: list[Any],
+        errors,
+        columns: dict[Any, Any] | None = None,
+    ) -> bool:
+        """Fire matching rules for a batch of dict facts.
+
+        Returns False without running anything if the batch can't be packed
+        into numeric columns, in which case the caller should fall back.
+        ``columns`` caches the packed columns (None if a field isn't numeric)
+        across calls for the same, unchanged facts.
+        """
+        if columns is None:
+            columns = {}
+        # A non-empty cache was packed from these facts, so they are all dicts
+        if not columns and not all(type(fact) is dict for fact in facts):
+            return False
+        for key in self.keys:
+            if key in columns:
+                column = columns[key]
+            else:
+                column = columns[key] = _column(facts, *key)
+            if column is None:
+                return False
+
+        shape = (len(facts),)
+        masks = np.vstack(
+            [
+                np.broadcast_to(np.asarray(program(columns), dtype=bool), shape)
+                for program in self.programs
+            ]
+        )
+        # Transposed, nonzero() yields (fact, rule) pairs in per-fact priority order
+        fact_indexes, rule_indexes = np.nonzero(masks.T)
+
+        append = results.append
+        rules = self.rules
+        for fact_index, rule_index in zip(fact_indexes.tolist(), rule_indexes.tolist()):
+            rule = rules[rule_index]
+            try:
+                result = rule.action(facts[fact_index])
+                if result is not None:
+                    append(result)
+            except Exception as e:  # noqa: BLE001
+                errors.record(rule.name, e)
+        return True
@@ -1,18 +1,118 @@
-from typing import List, Dict, Any, Callable, Optional
+import ast
+import bisect
+import dis
+import heapq
+import inspect
+import operator
+import types
+from collections.abc import Callable, Iterator, Sequence
+from itertools import islice
+from typing import Any
+
+from .exceptions import RuleValidationError
+
+# Rule sets larger than this are only partially sorted at construction time
+_PARTIAL_SORT_THRESHOLD = 32
+
+# Minimum number of indexable rules before the alpha index is worth its overhead
+_ALPHA_INDEX_MIN_RULES = 8
+
+# Cost assumed for conditions whose code can't be inspected
+_UNKNOWN_COMPLEXITY = 100
+
+_COMPARISON_OPERATORS: dict[str, Callable[[Any, Any], Any]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+
+def _make_cmp(key: str, op: str, const: Any, default: Any = 0) -> Callable:
+    """Build a condition equivalent to ``fact.get(key, default) <op> const``.
+
+    The comparison is recorded on the returned function as ``_comparison``
+    so the engine can recognise it structurally without inspecting code.
+    """
+    compare = _COMPARISON_OPERATORS.get(op)
+    if compare is None:
+        raise RuleValidationError(
+            f"Unsupported comparison operator {op!r}, "
+            f"expected one of {sorted(_COMPARISON_OPERATORS)}"
+        )
+
+    def condition(fact):
+        return compare(fact.get(key, default), const)
+
+    condition._comparison = (key, op, const, default)  # type: ignore[attr-defined]
+    return condition
 
 
 class Rule:
     """
     Represents a single rule with condition and action.
+
+    Rules loaded from source expressions also keep those expressions in
+    ``_condition_expr`` and ``_action_expr`` for introspection; both are
+    None for rules built from Python callables.
+
+    ``complexity`` is an optional estimate of how expensive the condition is
+    to evaluate, used by reorderable execution sets to run cheaper rules
+    first within a priority. When None it is estimated from the condition.
     """
 
+    __slots__ = (
+        "_action_expr",
+        "_condition_expr",
+        "action",
+        "complexity",
+        "condition",
+        "name",
+        "priority",
+    )
+
     def __init__(
-        self, name: str, condition: Callable, action: Callable, priority: int = 0
+        self,
+        name: str,
+        condition: Callable,
+        action: Callable,
+        priority: int = 0,
+        complexity: int | None = None,
     ):
         self.name = name
         self.condition = condition
         self.action = action
         self.priority = priority
+        self.complexity = complexity
+        self._condition_expr: str | None = None
+        self._action_expr: str | None = None
+
+    @classmethod
+    def cmp(
+        cls,
+        name: str,
+        key: str,
+        op: str,
+        const: Any,
+        action: Callable,
+        priority: int = 0,
+        default: Any = 0,
+    ) -> "Rule":
+        """Create a rule whose condition is ``fact.get(key, default) <op> const``.
+
+        Supported operators are ``==``, ``!=``, ``>``, ``>=``, ``<`` and ``<=``.
+
+        Example:
+            >>> Rule.cmp("adult", "age", ">=", 18, lambda f: {"status": "adult"})
+        """
+        return cls(
+            name=name,
+            condition=_make_cmp(key, op, const, default),
+            action=action,
+            priority=priority,
+        )
 
     def __str__(self):
         return f"Rule(name={self.name}, priority={self.priority})"
@@ -21,21 +121,418 @@ class Rule:
         return self.__str__()
 
 
+def _is_always_true(condition: Callable) -> bool:
+    """Detect conditions that are literally ``lambda fact: True``.
+
+    Only plain functions whose bytecode is "return the constant True" qualify;
+    anything else (including truthy-but-computed results) is evaluated normally.
+    """
+    if not isinstance(condition, types.FunctionType):
+        return False
+    code = condition.__code__
+    if code.co_argcount != 1 or code.co_flags & (
+        inspect.CO_VARARGS | inspect.CO_VARKEYWORDS
+    ):
+        return False
+    ops = [
+        ins
+        for ins in dis.get_instructions(code)
+        if ins.opname not in ("RESUME", "NOP", "CACHE")
+    ]
+    if len(ops) == 1:
+        # Python 3.12+ folds the load and return into RETURN_CONST
+        return ops[0].opname == "RETURN_CONST" and ops[0].argval is True
+    return (
+        len(ops) == 2
+        and ops[0].opname == "LOAD_CONST"
+        and ops[0].argval is True
+        and ops[1].opname == "RETURN_VALUE"
+    )
+
+
+def _is_priority_ordered(rules: list[Rule]) -> bool:
+    """Check in O(n) whether rules are already in non-increasing priority order."""
+    return all(
+        rules[i].priority >= rules[i + 1].priority for i in range(len(rules) - 1)
+    )
+
+
+def _sort_by_priority(rules: list[Rule]) -> list[Rule]:
+    """Return rules ordered by descending priority.
+
+    Rule sets are frequently authored in priority order already, so an O(n)
+    monotonicity check runs first and the sort is skipped entirely when the
+    input is already non-increasing. The result is identical to a stable
+    ``sorted(..., reverse=True)``: rules with equal priority keep their
+    original relative order either way.
+    """
+    if _is_priority_ordered(rules):
+        return list(rules)
+    return sorted(rules, key=lambda r: r.priority, reverse=True)
+
+
+def _count_instructions(code: types.CodeType) -> int:
+    """Number of bytecode instructions in ``code``, ignoring no-ops."""
+    return sum(
+        1
+        for ins in dis.get_instructions(code)
+        if ins.opname not in ("RESUME", "NOP", "CACHE")
+    )
+
+
+def _complexity(rule: Rule) -> int:
+    """Estimated cost of evaluating the rule's condition.
+
+    An explicit ``rule.complexity`` wins. Otherwise ``Rule.cmp`` conditions
+    count as a single comparison, and other conditions are measured in
+    bytecode instructions of their source expression or Python function.
+    Conditions that can't be inspected get ``_UNKNOWN_COMPLEXITY``.
+    """
+    if rule.complexity is not None:
+        return rule.complexity
+    condition = rule.condition
+    if getattr(condition, "_comparison", None) is not None:
+        return 1
+    src = rule._condition_expr
+    if isinstance(src, str):
+        try:
+            return _count_instructions(compile(src.strip(), "<rule>", "eval"))
+        except SyntaxError:
+            return _UNKNOWN_COMPLEXITY
+    if isinstance(condition, types.FunctionType):
+        return _count_instructions(condition.__code__)
+    return _UNKNOWN_COMPLEXITY
+
+
+def _sort_by_priority_and_cost(rules: list[Rule]) -> list[Rule]:
+    """Order rules by descending priority, cheapest condition first within a priority.
+
+    Rules with equal priority and complexity keep their relative order.
+    """
+    return sorted(rules, key=lambda r: (-r.priority, _complexity(r)))
+
+
+def _negated_priority(rule: Rule) -> Any:
+    """Sort key that puts higher priorities first in an ascending sequence."""
+    return -rule.priority
+
+
+def _partition_by_priority(rules: list[Rule]) -> tuple[list[Rule], list[Rule]]:
+    """Split rules into a sorted head of the top ~log2(n) rules and an unsorted tail.
+
+    Concatenating the head with the stably sorted tail yields exactly the
+    order produced by ``_sort_by_priority``.
+    """
+    if len(rules) <= _PARTIAL_SORT_THRESHOLD or _is_priority_ordered(rules):
+        return _sort_by_priority(rules), []
+
+    # Key on (priority, -index) so ties resolve in input order, as a stable sort would
+    top = heapq.nlargest(
+        len(rules).bit_length(),
+        enumerate(rules),
+        key=lambda item: (item[1].priority, -item[0]),
+    )
+    head_indexes = {index for index, _ in top}
+    head = [rule for _, rule in top]
+    tail = [rule for index, rule in enumerate(rules) if index not in head_indexes]
+    return head, tail
+
+
+def _match_get_eq(node: ast.AST) -> tuple[Any, Any, Any] | None:
+    """Match ``fact.get(key[, default]) == value`` with constant operands.
+
+    Returns ``(key, default, value)``, or None if the node has another shape.
+    """
+    if not (
+        isinstance(node, ast.Compare)
+        and len(node.ops) == 1
+        and isinstance(node.ops[0], ast.Eq)
+    ):
+        return None
+    call, const = node.left, node.comparators[0]
+    if isinstance(call, ast.Constant):
+        call, const = const, call
+    if not (
+        isinstance(const, ast.Constant)
+        and isinstance(call, ast.Call)
+        and isinstance(call.func, ast.Attribute)
+        and call.func.attr == "get"
+        and isinstance(call.func.value, ast.Name)
+        and call.func.value.id == "fact"
+        and not call.keywords
+        and 1 <= len(call.args) <= 2
+        and all(isinstance(arg, ast.Constant) for arg in call.args)
+    ):
+        return None
+    args = [arg.value for arg in call.args]  # type: ignore[attr-defined]
+    default = args[1] if len(args) == 2 else None
+    return args[0], default, const.value
+
+
+def _equality_test(rule: Rule) -> tuple[tuple[Any, Any, Any], bool] | None:
+    """Find an equality test the rule's condition requires in order to match.
+
+    Returns the ``(key, default, value)`` test and whether the condition is
+    exactly that test, in which case passing it is enough to match.
+    """
+    comparison = getattr(rule.condition, "_comparison", None)
+    if comparison is not None:
+        key, op, const, default = comparison
+        if op != "==":
+            return None
+        try:
+            # The key and default name the bucket and the constant keys it
+            hash((key, default, const))
+        except TypeError:
+            return None
+        return (key, default, const), True
+
+    src = getattr(rule, "_condition_expr", None)
+    if not isinstance(src, str):
+        return None
+    try:
+        body = ast.parse(src.strip(), mode="eval").body
+    except SyntaxError:
+        return None
+    if isinstance(body, ast.BoolOp) and isinstance(body.op, ast.And):
+        conjuncts = body.values
+    else:
+        conjuncts = [body]
+    for conjunct in conjuncts:
+        found = _match_get_eq(conjunct)
+        if found is not None:
+            return found, conjunct is body
+    return None
+
+
+def _discriminator(rule: Rule) -> tuple[Any, Any, Any] | None:
+    """Find an equality test the rule's condition requires in order to match.
+
+    Recognises ``Rule.cmp`` conditions using ``==`` and loaded rules whose
+    source expression is, or is a conjunction including,
+    ``fact.get(key[, default]) == value``. Returns ``(key, default, value)``.
+    """
+    found = _equality_test(rule)
+    return None if found is None else found[0]
+
+
+def _condition_key(rule: Rule) -> Any:
+    """Structural key under which rules with equivalent conditions coincide.
+
+    ``Rule.cmp`` conditions are keyed on their comparison and loaded rules
+    on the parsed form of their condition expression, so formatting does not
+    matter. Any other condition is keyed on the identity of the callable,
+    which the rule keeps alive.
+    """
+    comparison = getattr(rule.condition, "_comparison", None)
+    if comparison is not None:
+        key, op, const, default = comparison
+        # Tag constants with their type so 1, 1.0 and True stay distinct
+        found = ("cmp", key, op, (type(const), const), (type(default), default))
+        try:
+            hash(found)
+        except TypeError:
+            return ("id", id(rule.condition))
+        return found
+
+    src = rule._condition_expr
+    if isinstance(src, str):
+        try:
+            return ("expr", ast.dump(ast.parse(src.strip(), mode="eval")))
+        except SyntaxError:
+            pass
+    return ("id", id(rule.condition))
+
+
+class _AlphaIndex:
+    """Rete-style alpha memory keyed on constant equality tests.
+
+    Rules with a discriminator ``fact.get(key, default) == value`` are
+    bucketed under ``(key, default)`` and then ``value``; a fact only has to
+    look up its own value for each key to find the rules that can match.
+    Rules without a discriminator stay in a residual list that is always
+    scanned. Indexes refer to positions in the priority-ordered rule list.
+    """
+
+    __slots__ = ("exact", "indexed", "residual", "tests")
+
+    def __init__(self, rules: Sequence[Rule]):
+        self.tests: dict[tuple[Any, Any], dict[Any, list[int]]] = {}
+        self.residual: list[int] = []
+        self.indexed = 0
+        # exact[i] is True when rule i's condition is nothing but its equality
+        # test, so a bucket hit alone proves the match
+        self.exact: list[bool] = []
+        for index, rule in enumerate(rules):
+            found = _equality_test(rule)
+            if found is None:
+                self.residual.append(index)
+                self.exact.append(False)
+                continue
+            (key, default, value), exact = found
+            buckets = self.tests.setdefault((key, default), {})
+            buckets.setdefault(value, []).append(index)
+            self.indexed += 1
+            # NaN-like constants only reach their bucket by identity, not
+            # equality; comparing the value to itself is what detects them
+            self.exact.append(exact and value == value)  # noqa: PLR0124
+
+    def candidates(self, fact: dict[Any, Any]) -> tuple[Sequence[int], bool]:
+        """Indexes of the rules that may match ``fact``, in priority order.
+
+        Also returns whether every key's value was looked up by hash; if so,
+        ``exact`` candidates are known to match without running their
+        condition. Each bucket is already in priority order, so results are
+        only merged when more than one bucket contributes. The result must
+        not be mutated.
+        """
+        runs = [self.residual] if self.residual else []
+        hashed = True
+        for (key, default), buckets in self.tests.items():
+            try:
+                hit = buckets.get(fact.get(key, default))
+            except TypeError:
+                # Unhashable value: can't prefilter, keep every rule on this key
+                runs.extend(buckets.values())
+                hashed = False
+                continue
+            if hit:
+                runs.append(hit)
+        if len(runs) == 1:
+            return runs[0], hashed
+        # Timsort finds the presorted runs, so this sort is a k-way merge
+        merged = [index for run in runs for index in run]
+        merged.sort()
+        return merged, hashed
+
+
 class RuleExecutionSet:
     """
     A collection of rules that can be executed together.
     Follows JSR-94 specification for RuleExecutionSet.
+
+    Rules are kept in descending priority order. For large sets only the
+    highest-priority rules are sorted up front; the remainder is sorted the
+    first time it is needed, which FIRST_MATCH execution may never require.
+
+    Args:
+        name: Name of the execution set
+        rules: Rules to execute
+        properties: Optional properties such as "description" and "strategy"
+        memoize: If True, condition results are cached per execution for facts
+            that compare equal. Only enable this when conditions are pure
+            functions of the fact.
+        vectorize: If True and numpy is installed, large batches of dict facts
+            are evaluated with array operations when every condition is a
+            numeric comparison, or matched by a numba kernel when every rule
+            tests one integer field for equality. All conditions are
+            evaluated before any action runs, and a session reuses the
+            packed fields until facts are added or cleared, so only enable
+            this when neither actions nor callers modify facts in place.
+        reorderable: If True, rules with equal priority are ordered by
+            ascending condition complexity instead of insertion order, so
+            cheap checks run before expensive ones. This changes which rule
+            wins a FIRST_MATCH tie and the order of ALL_MATCHES results.
     """
 
     def __init__(
-        self, name: str, rules: List[Rule], properties: Optional[Dict[str, Any]] = None
+        self,
+        name: str,
+        rules: list[Rule],
+        properties: dict[str, Any] | None = None,
+        memoize: bool = False,
+        vectorize: bool = False,
+        reorderable: bool = False,
     ):
         self.name = name
-        self.rules = sorted(rules, key=lambda r: r.priority, reverse=True)
+        self.memoize = memoize
+        self.vectorize = vectorize
+        self.reorderable = reorderable
+        if reorderable:
+            rules = _sort_by_priority_and_cost(rules)
+        self._head, self._tail = _partition_by_priority(rules)
+        # The full order is an immutable tuple so the caches below can't go stale
+        self._rules: tuple[Rule, ...] | None = None if self._tail else tuple(self._head)
+        # When every condition is `lambda f: True`, execution skips condition calls
+        self._unconditional = bool(rules) and all(
+            _is_always_true(rule.condition) for rule in rules
+        )
         self.properties = properties or {}
+        self._alpha_index: _AlphaIndex | None = None
+        self._alpha_index_built = False
+        self._condition_keys: tuple[Any, ...] | None = None
+        # Compiled lazily by the adapter when vectorize is enabled
+        self._vectorized: Any = None
+        self._vectorized_built = False
+        # Compiled lazily by the adapter for FIRST_MATCH over expression rules
+        self._first_match: Any = None
+        self._first_match_built = False
+
+    @property
+    def rules(self) -> tuple[Rule, ...]:
+        """All rules in descending priority order."""
+        rules = self._rules
+        if rules is None:
+            rules = tuple(self._head) + tuple(
+                sorted(self._tail, key=lambda r: r.priority, reverse=True)
+            )
+            self._rules = rules
+        return rules
+
+    def iter_rules(self) -> Iterator[Rule]:
+        """Iterate rules in priority order, sorting the tail only if it is reached."""
+        yield from self._head
+        if self._tail:
+            yield from islice(self.rules, len(self._head), None)
+
+    @property
+    def alpha_index(self) -> _AlphaIndex | None:
+        """Equality-test index over ``rules``, or None if too few rules are indexable.
+
+        Built on first use, since it needs the fully sorted rule list.
+        """
+        if not self._alpha_index_built:
+            index = _AlphaIndex(self.rules)
+            if index.indexed >= _ALPHA_INDEX_MIN_RULES:
+                self._alpha_index = index
+            self._alpha_index_built = True
+        return self._alpha_index
+
+    @property
+    def condition_keys(self) -> tuple[Any, ...]:
+        """Structural key of each rule's condition, aligned with ``rules``.
+
+        Rules whose conditions have equal keys always agree on whether a
+        fact matches, provided their conditions are pure. Built on first use.
+        """
+        keys = self._condition_keys
+        if keys is None:
+            keys = self._condition_keys = tuple(
+                _condition_key(rule) for rule in self.rules
+            )
+        return keys
+
+    def with_rules(self, *rules: Rule, name: str | None = None) -> "RuleExecutionSet":
+        """Return a new execution set with ``rules`` added; this one is unchanged.
+
+        Each rule is binary-inserted after existing rules of equal priority,
+        which gives the order of ``list(self.rules) + list(rules)`` without
+        re-sorting. Properties and options are carried over.
+        """
+        merged = list(self.rules)
+        for rule in rules:
+            bisect.insort_right(merged, rule, key=_negated_priority)
+        return RuleExecutionSet(
+            name=self.name if name is None else name,
+            rules=merged,
+            properties=dict(self.properties),
+            memoize=self.memoize,
+            vectorize=self.vectorize,
+            reorderable=self.reorderable,
+        )
 
-    def get_rules(self) -> List[Rule]:
-        """Get all rules in this execution set."""
+    def get_rules(self) -> tuple[Rule, ...]:
+        """Get all rules in this execution set, in descending priority order."""
         return self.rules
 
     def get_name(self) -> str:
@@ -46,7 +543,7 @@ class RuleExecutionSet:
         """Get the description of this execution set."""
         return self.properties.get("description", "")
 
-    def get_properties(self) -> Dict[str, Any]:
+    def get_properties(self) -> dict[str, Any]:
         """Get all properties of this execution set."""
         return self.properties.copy()
 
@@ -1,4 +1,4 @@
-from typing import Dict, Optional
+import sys
 from abc import ABC, abstractmethod
 
 # Forward references to avoid circular imports
@@ -18,12 +18,10 @@ class RuleServiceProvider(ABC):
     @abstractmethod
     def get_rule_administrator(self) -> "RuleAdministrator":
         """Get the rule administrator for this provider."""
-        pass
 
     @abstractmethod
     def get_rule_runtime(self) -> "RuleRuntime":
         """Get the rule runtime for this provider."""
-        pass
 
 
 class RuleServiceProviderManager:
@@ -32,15 +30,18 @@ class RuleServiceProviderManager:
     Follows JSR-94 specification for RuleServiceProviderManager.
     """
 
-    _providers: Dict[str, RuleServiceProvider] = {}
+    _providers: dict[str, RuleServiceProvider] = {}
 
     @classmethod
     def register(cls, uri: str, provider: RuleServiceProvider):
         """Register a rule service provider with the given URI."""
+        if isinstance(uri, str):
+            # Interned keys let lookups with the same literal match by identity
+            uri = sys.intern(uri)
         cls._providers[uri] = provider
 
     @classmethod
-    def get(cls, uri: str) -> Optional[RuleServiceProvider]:
+    def get(cls, uri: str) -> RuleServiceProvider | None:
         """Get a rule service provider by URI."""
         return cls._providers.get(uri)
 
@@ -1,14 +1,238 @@
-import yaml  # type: ignore[import-untyped]
+import ast
+import functools
 import logging
-from typing import Dict, Any
+import os
+from collections.abc import Callable
+from typing import IO, Any, Union
+
+import yaml  # type: ignore[import-untyped]
 from pydantic import ValidationError
-from machine_rules.api.execution_set import RuleExecutionSet, Rule
+
 from machine_rules.api.exceptions import RuleValidationError
-from machine_rules.security import safe_eval, SecurityError
+from machine_rules.api.execution_set import Rule, RuleExecutionSet
 from machine_rules.schemas.rule_schema import RuleSetDefinition
+from machine_rules.security.safe_evaluator import SecurityError, _parse_checked
+
+try:
+    # libyaml-backed parser; same safe constructor, parsed in C
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader  # type: ignore[assignment]
+
+try:
+    # JSON rule files skip the YAML pipeline entirely
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
+# Globals for compiled rule expressions: no builtins, only plain converters.
+# Each expression becomes a function whose only parameter is ``fact``.
+SAFE_GLOBALS: dict[str, Any] = {
+    "__builtins__": {},
+    "int": int,
+    "float": float,
+    "str": str,
+    "list": list,
+    "tuple": tuple,
+    "dict": dict,
+    "set": set,
+}
+
+_ALLOWED_NAMES = frozenset(SAFE_GLOBALS) - {"__builtins__"} | {"fact"}
+
+# Longest string or sequence that ``*`` and ``+`` may build (simpleeval's
+# limit). This only stops the obvious blow-ups; ``%`` formatting, replace()
+# and join() are not bounded, so it is not a memory limit.
+MAX_SEQUENCE_LENGTH = 100000
+
+
+def _too_long(length: int):
+    raise RuleValidationError(
+        f"Expression would build a sequence of length {length}, "
+        f"over the limit of {MAX_SEQUENCE_LENGTH}"
+    )
+
+
+def _guarded_mult(a: Any, b: Any) -> Any:
+    """``a * b``, refusing to repeat a sequence past ``MAX_SEQUENCE_LENGTH``."""
+    if (
+        hasattr(a, "__len__")
+        and isinstance(b, int)
+        and b * len(a) > MAX_SEQUENCE_LENGTH
+    ):
+        _too_long(b * len(a))
+    if (
+        hasattr(b, "__len__")
+        and isinstance(a, int)
+        and a * len(b) > MAX_SEQUENCE_LENGTH
+    ):
+        _too_long(a * len(b))
+    return a * b
+
+
+def _guarded_add(a: Any, b: Any) -> Any:
+    """``a + b``, refusing to concatenate sequences past ``MAX_SEQUENCE_LENGTH``."""
+    if (
+        hasattr(a, "__len__")
+        and hasattr(b, "__len__")
+        and len(a) + len(b) > MAX_SEQUENCE_LENGTH
+    ):
+        _too_long(len(a) + len(b))
+    return a + b
+
+
+# Bound under underscore names, which the validator never lets an expression
+# reference, so only the rewritten operators can reach them
+_GUARD_GLOBALS: dict[str, Any] = {"_mult": _guarded_mult, "_add": _guarded_add}
+_GUARDED_OPERATORS = {ast.Mult: "_mult", ast.Add: "_add"}
+
+
+class _OperatorGuard(ast.NodeTransformer):
+    """Rewrite ``*`` and ``+`` into calls to the size-checking guards.
+
+    Operations on two constants are checked at load time instead, so a
+    literal like ``'a' * 100000000`` is rejected before any rule runs.
+    """
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.expr:
+        self.generic_visit(node)
+        guard = _GUARDED_OPERATORS.get(type(node.op))
+        if guard is None:
+            return node
+        if isinstance(node.left, ast.Constant) and isinstance(node.right, ast.Constant):
+            _GUARD_GLOBALS[guard](node.left.value, node.right.value)
+            return node
+        return ast.copy_location(
+            ast.Call(
+                func=ast.Name(id=guard, ctx=ast.Load()),
+                args=[node.left, node.right],
+                keywords=[],
+            ),
+            node,
+        )
+
+
+def _guard_operators(node: ast.expr) -> ast.expr:
+    """Apply ``_OperatorGuard`` to a validated expression tree."""
+    return _OperatorGuard().visit(node)
+
+
+# Skeleton for compiled expressions. The expression's statements replace
+# ``pass``; errors are reported through ``_on_error`` inside the same frame,
+# so calling a loaded rule's condition or action is a single function call.
+_FUNCTION_SKELETON = """
+def _bind(_on_error, _template):
+    def evaluate(fact):
+        try:
+            pass
+        except Exception as e:
+            return _on_error(e)
+    return evaluate
+"""
+
+_ErrorHandler = Callable[[Exception], Any]
+
+
+def _dict_template(node: ast.Dict) -> tuple[dict[Any, Any], list[ast.stmt]] | None:
+    """Split a dict literal into a template of its constant entries plus assignments.
+
+    Returns None unless every key is a distinct constant and at least one
+    value is a constant. The statements copy the template (bound as
+    ``_template``) and assign the computed values in source order into
+    placeholder slots, so the result keeps the literal's key order. Only
+    immutable constants go into the shared template, so results never share
+    mutable values.
+    """
+    keys: list[Any] = []
+    for key in node.keys:
+        if not isinstance(key, ast.Constant):
+            return None
+        keys.append(key.value)
+    if len(set(keys)) != len(keys):
+        return None
+
+    template: dict[Any, Any] = {}
+    computed: list[tuple[Any, ast.expr]] = []
+    for key, value in zip(keys, node.values):
+        if isinstance(value, ast.Constant):
+            template[key] = value.value
+        else:
+            template[key] = None
+            computed.append((key, value))
+    if len(computed) == len(keys):
+        return None
+
+    statements: list[ast.stmt] = ast.parse("result = _template.copy()").body
+    statements += [
+        ast.Assign(
+            targets=[
+                ast.Subscript(
+                    value=ast.Name(id="result", ctx=ast.Load()),
+                    slice=ast.Constant(value=key),
+                    ctx=ast.Store(),
+                )
+            ],
+            value=value,
+            lineno=value.lineno,
+        )
+        for key, value in computed
+    ]
+    statements.append(ast.Return(value=ast.Name(id="result", ctx=ast.Load())))
+    return template, statements
+
+
+@functools.lru_cache(maxsize=4096)
+def _compile_expression(src: str) -> Callable[[_ErrorHandler], Callable[[Any], Any]]:
+    """Validate a rule expression and compile it to a function of ``fact``.
+
+    The expression is parsed once; the same tree is checked against the
+    whitelist ``safe_eval`` also uses, restricted to ``fact`` and the
+    converters in ``SAFE_GLOBALS``, and then compiled. Only
+    after validation is the tree placed in the body of ``evaluate(fact)``,
+    which makes ``fact`` a fast local instead of a name looked up in a fresh
+    locals dict on every ``eval()``. Dict literals with constant entries are
+    built from a prebuilt template instead (see ``_dict_template``).
+
+    Returns a factory that binds the error handler, whose return value
+    stands in for the expression's when it raises. Factories are cached by
+    source text, so identical expressions across rules and repeated loads
+    share one code object. Invalid expressions raise and are never cached.
+    """
+    try:
+        tree = _parse_checked(src, _ALLOWED_NAMES)
+    except SecurityError as e:
+        raise RuleValidationError(f"Expression is unsafe ({e}): {src}")
+    except ValueError as e:
+        raise RuleValidationError(f"{e}: {src}")
+    tree.body = _guard_operators(tree.body)
+
+    found = _dict_template(tree.body) if isinstance(tree.body, ast.Dict) else None
+    if found is not None:
+        template, statements = found
+    else:
+        template = None
+        statements = [ast.Return(value=tree.body, lineno=tree.body.lineno)]
+
+    module = ast.parse(_FUNCTION_SKELETON)
+    bind = module.body[0]
+    assert isinstance(bind, ast.FunctionDef)
+    evaluate = bind.body[0]
+    assert isinstance(evaluate, ast.FunctionDef)
+    guard = evaluate.body[0]
+    assert isinstance(guard, ast.Try)
+    guard.body = statements
+    ast.fix_missing_locations(module)
+
+    # Exception and the guards are only visible to the skeleton: the
+    # validator has already rejected every name an expression could use to
+    # reach them
+    namespace = dict(SAFE_GLOBALS, Exception=Exception, **_GUARD_GLOBALS)
+    # Only whitelisted expression nodes are spliced into the fixed skeleton
+    exec(compile(module, "<rule>", "exec"), namespace)  # noqa: S102
+    return functools.partial(namespace["_bind"], _template=template)
+
 
 class YAMLRuleLoader:
     """
@@ -31,15 +255,29 @@ class YAMLRuleLoader:
     """
 
     @staticmethod
-    def from_file(filepath: str) -> RuleExecutionSet:
-        """Load rules from a YAML file."""
+    def from_file(filepath: Union[str, "os.PathLike[str]"]) -> RuleExecutionSet:
+        """Load rules from a YAML file, or a JSON file if it ends in ``.json``.
+
+        ``filepath`` may be a string or a path object such as
+        ``pathlib.Path``. JSON files use the same schema and are parsed with
+        orjson when it is installed. To load rules that are already in
+        memory, use ``from_stream`` instead.
+        """
+        if os.fspath(filepath).lower().endswith(".json"):
+            with open(filepath, "rb") as binary_file:
+                return YAMLRuleLoader.from_dict(_json_loads(binary_file.read()))
         with open(filepath, "r") as file:
-            data = yaml.safe_load(file)
+            return YAMLRuleLoader.from_stream(file)
+
+    @staticmethod
+    def from_stream(stream: str | IO[str]) -> RuleExecutionSet:
+        """Load rules from a YAML string or text stream, such as ``io.StringIO``."""
+        data = yaml.load(stream, Loader=_SafeLoader)
 
         return YAMLRuleLoader.from_dict(data)
 
     @staticmethod
-    def from_dict(data: Dict[str, Any]) -> RuleExecutionSet:
+    def from_dict(data: dict[str, Any]) -> RuleExecutionSet:
         """Load rules from a dictionary structure.
 
         Validates the input structure using Pydantic schemas before creating rules.
@@ -73,38 +311,45 @@ class YAMLRuleLoader:
             rules.append(rule)
 
         properties = {"description": description, "source": "yaml"}
+        if validated_data.strategy is not None:
+            properties["strategy"] = validated_data.strategy
 
-        return RuleExecutionSet(name=name, rules=rules, properties=properties)
+        return RuleExecutionSet(
+            name=name,
+            rules=rules,
+            properties=properties,
+            vectorize=validated_data.vectorize,
+        )
 
     @staticmethod
-    def _create_rule_from_definition(rule_def: Dict[str, Any]) -> Rule:
+    def _create_rule_from_definition(rule_def: dict[str, Any]) -> Rule:
         """Create a Rule object from a rule definition dictionary."""
         name = rule_def.get("name", "unnamed_rule")
         condition_expr = rule_def.get("condition", "True")
         action_expr = rule_def.get("action", "None")
         priority = rule_def.get("priority", 0)
 
-        # Use safe evaluator instead of eval()
-        def condition_func(fact):
-            try:
-                return safe_eval(condition_expr, {"fact": fact})
-            except SecurityError as e:
-                logger.error(f"Security error in condition for rule {name}: {e}")
-                return False
-            except Exception as e:
-                logger.error(f"Error evaluating condition for rule {name}: {e}")
-                return False
-
-        def action_func(fact):
-            try:
-                return safe_eval(action_expr, {"fact": fact})
-            except SecurityError as e:
-                logger.error(f"Security error in action for rule {name}: {e}")
-                return None
-            except Exception as e:
-                logger.error(f"Error evaluating action for rule {name}: {e}")
-                return None
-
-        return Rule(
-            name=name, condition=condition_func, action=action_func, priority=priority
+        # Validate and compile once; evaluation is a plain function call
+        bind_condition = _compile_expression(condition_expr)
+        bind_action = _compile_expression(action_expr)
+
+        def condition_error(e):
+            logger.error(f"Error evaluating condition for rule {name}: {e}")
+            return False
+
+        def action_error(e):
+            logger.error(f"Error evaluating action for rule {name}: {e}")
+
+        condition = bind_condition(condition_error)
+        # Lets the compiled FIRST_MATCH path report errors from its inlined copy
+        condition._on_error = condition_error  # type: ignore[attr-defined]
+        rule = Rule(
+            name=name,
+            condition=condition,
+            action=bind_action(action_error),
+            priority=priority,
         )
+        # Keep the source expressions for introspection (e.g. the MCP server)
+        rule._condition_expr = condition_expr
+        rule._action_expr = action_expr
+        return rule
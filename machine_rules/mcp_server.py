@@ -16,9 +16,8 @@ from typing import Any
 from mcp.server.fastmcp import FastMCP
 
 from machine_rules.adapters.machine_adapter import MachineRuleServiceProvider
-from machine_rules.api.exceptions import RuleEngineError
-from machine_rules.loader.yaml_loader import YAMLRuleLoader
-from machine_rules.security.safe_evaluator import validate_expression
+from machine_rules.api.exceptions import RuleEngineError, RuleValidationError
+from machine_rules.loader.yaml_loader import YAMLRuleLoader, _compile_expression
 
 logger = logging.getLogger(__name__)
 
@@ -136,13 +135,21 @@ def deregister_rule_set(name: str) -> str:
 def check_expression(expression: str) -> dict[str, Any]:
     """Check whether a rule expression is safe for use in conditions or actions.
 
+    Runs the same validation as loading a rule, so an expression is safe
+    exactly when ``register_rule_set`` would accept it.
+
     Args:
         expression: The expression string to validate.
 
     Returns:
         Dict with 'safe' (bool) and 'expression' (str) keys.
     """
-    safe = validate_expression(expression)
+    try:
+        _compile_expression(expression)
+    except RuleValidationError:
+        safe = False
+    else:
+        safe = True
     return {"safe": safe, "expression": expression}
 
 
@@ -1,10 +1,14 @@
-from pydantic import BaseModel, Field, field_validator
-from typing import List, Optional
-import re
+from typing import Literal
+
+from pydantic import BaseModel, Field
 
 
 class RuleDefinition(BaseModel):
-    """Schema for a single rule definition."""
+    """Schema for a single rule definition.
+
+    Only the structure is checked here; expression safety is enforced when
+    YAMLRuleLoader parses and compiles each expression.
+    """
 
     name: str = Field(..., min_length=1, description="Rule name")
     condition: str = Field(..., min_length=1, description="Rule condition expression")
@@ -13,35 +17,21 @@ class RuleDefinition(BaseModel):
         default=0, description="Rule priority (higher = executes first)"
     )
 
-    @field_validator("condition", "action")
-    @classmethod
-    def validate_expression_safety(cls, v: str) -> str:
-        """Validate that expressions don't contain dangerous patterns."""
-        dangerous_patterns = [
-            r"__import__",
-            r"eval\s*\(",
-            r"exec\s*\(",
-            r"compile\s*\(",
-            r"__builtins__",
-            r"open\s*\(",
-            r"file\s*\(",
-        ]
-
-        for pattern in dangerous_patterns:
-            if re.search(pattern, v, re.IGNORECASE):
-                raise ValueError(
-                    f"Expression contains forbidden pattern '{pattern}' which could be unsafe. "
-                    f"Use safe expressions only."
-                )
-        return v
-
 
 class RuleSetDefinition(BaseModel):
     """Schema for a complete rule set definition."""
 
     name: str = Field(..., min_length=1, description="Rule set name")
-    description: Optional[str] = Field(default="", description="Rule set description")
-    rules: List[RuleDefinition] = Field(..., description="List of rules")
+    description: str | None = Field(default="", description="Rule set description")
+    strategy: Literal["ALL_MATCHES", "FIRST_MATCH"] | None = Field(
+        default=None,
+        description="Execution strategy; FIRST_MATCH fires only the top matching rule",
+    )
+    vectorize: bool = Field(
+        default=False,
+        description="Evaluate numeric conditions over large fact batches with NumPy",
+    )
+    rules: list[RuleDefinition] = Field(..., description="List of rules")
 
     model_config = {
         "json_schema_extra": {
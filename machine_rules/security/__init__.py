@@ -4,6 +4,6 @@ Security module for Machine Rules Engine.
 This module provides safe expression evaluation to prevent code injection attacks.
 """
 
-from .safe_evaluator import safe_eval, SecurityError
+from .safe_evaluator import SecurityError, compile_safe, safe_eval
 
-__all__ = ["safe_eval", "SecurityError"]
+__all__ = ["SecurityError", "compile_safe", "safe_eval"]
@@ -4,8 +4,9 @@ Safe expression evaluator for rule conditions and actions.
 This module provides a secure way to evaluate Python expressions in rules
 without allowing arbitrary code execution.
 
-Uses simpleeval library to provide a restricted Python expression evaluator
-that blocks dangerous operations like:
+Expressions are parsed once and checked against a whitelist of syntax
+nodes, then evaluated with the simpleeval library, which together block
+dangerous operations like:
 - Importing modules
 - Accessing __builtins__
 - Using eval/exec
@@ -21,15 +22,19 @@ Example:
     SecurityError: ...
 """
 
-from typing import Any, Dict
+import ast
 import logging
+from collections.abc import Callable
+from collections.abc import Set as AbstractSet
+from functools import lru_cache
+from typing import Any
 
 try:
     from simpleeval import (  # type: ignore[import-untyped]
+        AttributeDoesNotExist,
         EvalWithCompoundTypes,
-        NameNotDefined,
         FunctionNotDefined,
-        AttributeDoesNotExist,
+        NameNotDefined,
     )
 
     SIMPLEEVAL_AVAILABLE = True
@@ -42,10 +47,205 @@ logger = logging.getLogger(__name__)
 class SecurityError(Exception):
     """Raised when an expression attempts unsafe operations."""
 
-    pass
 
+def _require_simpleeval():
+    if not SIMPLEEVAL_AVAILABLE:
+        logger.error(
+            "simpleeval library not available. Install it with: pip install simpleeval"
+        )
+        raise ImportError(
+            "simpleeval is required for safe expression evaluation. "
+            "Install it with: pip install simpleeval"
+        )
+
+
+# Syntax an expression may use; anything else (lambda, comprehensions,
+# walrus, f-strings, ...) is rejected before evaluation
+_ALLOWED_NODES = frozenset(
+    {
+        ast.Expression,
+        ast.BoolOp,
+        ast.And,
+        ast.Or,
+        ast.BinOp,
+        ast.Add,
+        ast.Sub,
+        ast.Mult,
+        ast.Div,
+        ast.FloorDiv,
+        ast.Mod,
+        ast.UnaryOp,
+        ast.Not,
+        ast.USub,
+        ast.UAdd,
+        ast.Compare,
+        ast.Eq,
+        ast.NotEq,
+        ast.Lt,
+        ast.LtE,
+        ast.Gt,
+        ast.GtE,
+        ast.In,
+        ast.NotIn,
+        ast.Is,
+        ast.IsNot,
+        ast.IfExp,
+        ast.Call,
+        ast.keyword,
+        ast.Attribute,
+        ast.Subscript,
+        ast.Slice,
+        ast.Name,
+        ast.Load,
+        ast.Constant,
+        ast.List,
+        ast.Tuple,
+        ast.Dict,
+        ast.Set,
+    }
+)
+
+# Builtins that must never be reachable, even if passed in as names
+_DANGEROUS_NAMES = frozenset(
+    {"eval", "exec", "compile", "open", "globals", "locals", "vars", "getattr"}
+)
+
+# Attributes that expose formatting or frame internals (as in simpleeval),
+# plus string padding methods that could build arbitrarily long results
+_DISALLOWED_ATTRIBUTES = _DANGEROUS_NAMES | {
+    "format",
+    "format_map",
+    "mro",
+    "tb_frame",
+    "gi_frame",
+    "ag_frame",
+    "cr_frame",
+    "center",
+    "ljust",
+    "rjust",
+    "zfill",
+    "expandtabs",
+}
+
+
+class _Validator(ast.NodeVisitor):
+    """Reject syntax outside the whitelist and unsafe names in one traversal.
+
+    ``names``, if given, are the only names an expression may use. Without
+    it, whether a name is defined depends on the names passed at evaluation
+    time, so that check is left to simpleeval.
+    """
+
+    def __init__(self, names: AbstractSet[str] | None = None):
+        self.names = names
+
+    def generic_visit(self, node: ast.AST):
+        if type(node) not in _ALLOWED_NODES:
+            raise SecurityError(
+                f"Expression uses disallowed syntax: {type(node).__name__.lower()}"
+            )
+        super().generic_visit(node)
 
-def safe_eval(expression: str, names: Dict[str, Any]) -> Any:
+    def visit_Name(self, node: ast.Name):
+        if node.id.startswith("_") or node.id in _DANGEROUS_NAMES:
+            raise SecurityError(f"Expression contains dangerous pattern: {node.id}")
+        if self.names is not None and node.id not in self.names:
+            raise SecurityError(f"Expression uses undefined or unsafe names: {node.id}")
+        self.generic_visit(node)
+
+    def visit_Attribute(self, node: ast.Attribute):
+        if node.attr.startswith("_") or node.attr in _DISALLOWED_ATTRIBUTES:
+            raise SecurityError(f"Expression contains dangerous pattern: {node.attr}")
+        self.generic_visit(node)
+
+
+def _parse_checked(
+    expression: str, names: AbstractSet[str] | None = None
+) -> ast.Expression:
+    """Parse an expression and check it against the syntax whitelist.
+
+    Every node must be an allowed type, and no name or attribute may start
+    with an underscore or be a dangerous builtin or attribute. If ``names``
+    is given, every name must also be one of them. Returns a fresh tree,
+    which the caller may transform.
+
+    Raises:
+        SecurityError: If the expression uses disallowed syntax or names
+        ValueError: If the expression is empty or not valid syntax
+    """
+    if not expression.strip():
+        raise ValueError("Expression cannot be empty")
+
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression syntax: {e}")
+
+    _Validator(names).visit(tree)
+    return tree
+
+
+@lru_cache(maxsize=1024)
+def _compile_checked(expression: str) -> ast.AST:
+    """Parse and check an expression for simpleeval, caching the result.
+
+    The checks only depend on the string, so results are cached; rejected
+    expressions raise again on every call because exceptions aren't cached.
+    """
+    return _parse_checked(expression).body
+
+
+def compile_safe(expression: str) -> Callable[[dict[str, Any]], Any]:
+    """
+    Check and parse an expression once, for repeated safe evaluation.
+
+    Runs the same checks as ``safe_eval`` up front, then returns a function
+    that evaluates the parsed expression against a names dictionary. Use it
+    when one expression is evaluated for many facts.
+
+    Args:
+        expression: Python expression string to compile
+
+    Returns:
+        Function taking the names available to the expression and returning
+        its result
+
+    Raises:
+        SecurityError: If the expression uses disallowed syntax or names
+        ValueError: If the expression is invalid
+
+    Example:
+        >>> is_high = compile_safe("fact.get('score', 0) > 80")
+        >>> is_high({'fact': {'score': 90}})
+        True
+    """
+    _require_simpleeval()
+
+    if not isinstance(expression, str):
+        raise ValueError(f"Expression must be a string, got {type(expression)}")
+
+    parsed = _compile_checked(expression)
+
+    def evaluate(names: dict[str, Any]) -> Any:
+        try:
+            # Use EvalWithCompoundTypes to support dict/list/tuple literals
+            # This allows expressions like {'key': 'value'} and ['item1', 'item2']
+            evaluator = EvalWithCompoundTypes(names=names)
+            return evaluator.eval(expression, previously_parsed=parsed)
+
+        except (NameNotDefined, FunctionNotDefined, AttributeDoesNotExist) as e:
+            # These are simpleeval-specific exceptions
+            raise SecurityError(f"Expression uses undefined or unsafe names: {e}")
+
+        except Exception as e:
+            # Catch any other exceptions and wrap in SecurityError
+            logger.warning(f"Expression evaluation failed: {e}")
+            raise SecurityError(f"Expression evaluation failed: {e}")
+
+    return evaluate
+
+
+def safe_eval(expression: str, names: dict[str, Any]) -> Any:
     """
     Safely evaluate a Python expression with restricted capabilities.
 
@@ -73,60 +273,7 @@ def safe_eval(expression: str, names: Dict[str, Any]) -> Any:
         >>> safe_eval("fact.get('score', 0) > 80", {'fact': {'score': 90}})
         True
     """
-    if not SIMPLEEVAL_AVAILABLE:
-        logger.error(
-            "simpleeval library not available. Install it with: pip install simpleeval"
-        )
-        raise ImportError(
-            "simpleeval is required for safe expression evaluation. "
-            "Install it with: pip install simpleeval"
-        )
-
-    if not isinstance(expression, str):
-        raise ValueError(f"Expression must be a string, got {type(expression)}")
-
-    if not expression.strip():
-        raise ValueError("Expression cannot be empty")
-
-    # Check for obviously dangerous patterns
-    dangerous_patterns = [
-        "__import__",
-        "__builtins__",
-        "eval",
-        "exec",
-        "compile",
-        "open",
-        "__class__",
-        "__base__",
-        "__subclasses__",
-        "__globals__",
-        "__code__",
-        "lambda",
-    ]
-
-    expression_lower = expression.lower()
-    for pattern in dangerous_patterns:
-        if pattern.lower() in expression_lower:
-            raise SecurityError(f"Expression contains dangerous pattern: {pattern}")
-
-    try:
-        # Use EvalWithCompoundTypes to support dict/list/tuple literals
-        # This allows expressions like {'key': 'value'} and ['item1', 'item2']
-        evaluator = EvalWithCompoundTypes(names=names)
-        result = evaluator.eval(expression)
-        return result
-
-    except (NameNotDefined, FunctionNotDefined, AttributeDoesNotExist) as e:
-        # These are simpleeval-specific exceptions
-        raise SecurityError(f"Expression uses undefined or unsafe names: {e}")
-
-    except SyntaxError as e:
-        raise ValueError(f"Invalid expression syntax: {e}")
-
-    except Exception as e:
-        # Catch any other exceptions and wrap in SecurityError
-        logger.warning(f"Expression evaluation failed: {e}")
-        raise SecurityError(f"Expression evaluation failed: {e}")
+    return compile_safe(expression)(names)
 
 
 def validate_expression(expression: str) -> bool:
@@ -0,0 +1,34 @@
+"""
+Shared fixtures for the Machine Rules test suite
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _init_machine_rules():
+    """Register the default providers once for the whole test run."""
+    import machine_rules
+
+    machine_rules.initialize()
+    yield
+
+
+@pytest.fixture(scope="module")
+def client():
+    """A FastAPI TestClient shared by every test in a module."""
+    from machine_rules.__main__ import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def provider():
+    """The provider registered as 'api'."""
+    from machine_rules.api.registry import RuleServiceProviderManager
+
+    api_provider = RuleServiceProviderManager.get("api")
+    assert api_provider is not None, "API provider should be registered"
+    return api_provider
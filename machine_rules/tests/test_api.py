@@ -3,20 +3,12 @@ Test suite for FastAPI integration
 """
 
 import pytest
-from fastapi.testclient import TestClient
 
 
 class TestFastAPIIntegration:
     """Test the FastAPI integration."""
 
-    def test_execute_endpoint_no_rules(self):
-        # Ensure initialization happens
-        import machine_rules  # noqa: F401
-
-        from machine_rules.__main__ import app
-
-        client = TestClient(app)
-
+    def test_execute_endpoint_no_rules(self, client):
         # Test with non-existent ruleset
         response = client.post(
             "/execute",
@@ -26,16 +18,9 @@ class TestFastAPIIntegration:
         # Should get a 400 error due to ValueError being raised
         assert response.status_code == 400
 
-    def test_execute_endpoint_with_rules(self):
-        # Ensure initialization happens
-        import machine_rules  # noqa: F401
-
-        from machine_rules.__main__ import app
-        from machine_rules.api.registry import RuleServiceProviderManager
+    def test_execute_endpoint_with_rules(self, client, provider):
         from machine_rules.api.execution_set import Rule, RuleExecutionSet
 
-        client = TestClient(app)
-
         # Set up a test rule
         def condition(fact):
             return fact.get("income", 0) > 50000
@@ -47,10 +32,6 @@ class TestFastAPIIntegration:
         execution_set = RuleExecutionSet(name="test_rules", rules=[rule])
 
         # Register the rule set
-        provider = RuleServiceProviderManager.get("api")
-        assert provider is not None, (
-            "RuleServiceProviderManager.get('api') returned None"
-        )
         admin = provider.get_rule_administrator()
         admin.register_rule_execution_set("test_income_rules", execution_set)
 
@@ -71,6 +52,33 @@ class TestFastAPIIntegration:
         assert len(data["results"]) == 1
         assert data["results"][0] == {"category": "high_income"}
 
+    def test_execute_endpoint_rejects_malformed_json(self, client):
+        response = client.post(
+            "/execute",
+            content=b'{"facts": [',
+            headers={"content-type": "application/json"},
+        )
+
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["type"] == "json_invalid"
+
+    def test_execute_endpoint_keeps_wide_integers(self, client, provider):
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
+
+        rule = Rule(name="echo", condition=lambda f: True, action=lambda f: f["id"])
+        execution_set = RuleExecutionSet(name="echo_rules", rules=[rule])
+        admin = provider.get_rule_administrator()
+        admin.register_rule_execution_set("test_echo_rules", execution_set)
+
+        ids = [2**64, -(2**63) - 1, 2**70, 7]
+        response = client.post(
+            "/execute",
+            json={"facts": [{"id": i} for i in ids], "ruleset_uri": "test_echo_rules"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["results"] == ids
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
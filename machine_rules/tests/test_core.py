@@ -25,6 +25,41 @@ class TestRule:
         assert rule.condition({"value": 5}) is False
         assert rule.action({"value": 15}) == {"result": "high"}
 
+    def test_rule_uses_slots(self):
+        from machine_rules.api.execution_set import Rule
+
+        rule = Rule(name="slotted", condition=lambda f: True, action=lambda f: None)
+
+        assert not hasattr(rule, "__dict__")
+        assert rule._condition_expr is None
+        assert rule._action_expr is None
+        with pytest.raises(AttributeError):
+            rule.description = "not a rule attribute"  # type: ignore[attr-defined]
+
+    def test_rule_cmp_factory(self):
+        from machine_rules.api.execution_set import Rule
+
+        rule = Rule.cmp(
+            "high_value", "value", ">", 10, lambda f: {"result": "high"}, priority=3
+        )
+
+        assert rule.name == "high_value"
+        assert rule.priority == 3
+        assert rule.condition({"value": 15}) is True
+        assert rule.condition({"value": 10}) is False
+        # Missing keys fall back to the default
+        assert rule.condition({}) is False
+        assert Rule.cmp("r", "tier", "==", "VIP", lambda f: 1).condition(
+            {"tier": "VIP"}
+        )
+
+    def test_rule_cmp_rejects_unknown_operator(self):
+        from machine_rules.api.exceptions import RuleValidationError
+        from machine_rules.api.execution_set import Rule
+
+        with pytest.raises(RuleValidationError, match="Unsupported comparison"):
+            Rule.cmp("bad", "value", "=~", 10, lambda f: None)
+
 
 class TestRuleExecutionSet:
     """Test the RuleExecutionSet class."""
@@ -74,6 +109,166 @@ class TestRuleExecutionSet:
         assert rules[1].name == "medium_priority"
         assert rules[2].name == "low_priority"
 
+    def test_presorted_rules_keep_order(self):
+        """Rules already in priority order should be kept as given."""
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
+
+        rules = [
+            Rule(name="a", condition=lambda f: True, action=lambda f: 1, priority=10),
+            Rule(name="b", condition=lambda f: True, action=lambda f: 2, priority=5),
+            Rule(name="c", condition=lambda f: True, action=lambda f: 3, priority=5),
+            Rule(name="d", condition=lambda f: True, action=lambda f: 4, priority=1),
+        ]
+
+        execution_set = RuleExecutionSet(name="test_set", rules=rules)
+
+        assert [r.name for r in execution_set.get_rules()] == ["a", "b", "c", "d"]
+        # The caller's list must not be aliased by the execution set
+        rules.pop()
+        assert len(execution_set.get_rules()) == 4
+        # The order is computed once and exposed immutably
+        assert isinstance(execution_set.get_rules(), tuple)
+        assert execution_set.get_rules() is execution_set.get_rules()
+
+    def test_large_unordered_set_matches_stable_sort(self):
+        """Partially sorted large sets should expose the same order as a full sort."""
+        import random
+
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
+
+        rng = random.Random(42)
+        rules = [
+            Rule(
+                name=f"rule_{i}",
+                condition=lambda f: True,
+                action=lambda f: None,
+                priority=rng.randint(0, 20),
+            )
+            for i in range(200)
+        ]
+
+        execution_set = RuleExecutionSet(name="test_set", rules=rules)
+        expected = sorted(rules, key=lambda r: r.priority, reverse=True)
+
+        assert list(execution_set.iter_rules()) == expected
+        assert execution_set.get_rules() == tuple(expected)
+
+    def test_with_rules_inserts_in_priority_order(self):
+        """with_rules() matches rebuilding from the combined rules, without mutation."""
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
+
+        def make(name, priority):
+            return Rule(
+                name=name,
+                condition=lambda f: True,
+                action=lambda f: name,
+                priority=priority,
+            )
+
+        base = RuleExecutionSet(
+            name="base",
+            rules=[make(f"r{i}", i % 4) for i in range(40)],
+            properties={"strategy": "FIRST_MATCH"},
+            memoize=True,
+        )
+        added = [make("top", 9), make("tie", 2), make("bottom", -1)]
+
+        extended = base.with_rules(*added, name="extended")
+        rebuilt = RuleExecutionSet(name="rebuilt", rules=list(base.rules) + added)
+
+        assert extended.get_rules() == rebuilt.get_rules()
+        assert extended.get_name() == "extended"
+        assert extended.properties == {"strategy": "FIRST_MATCH"}
+        assert extended.properties is not base.properties
+        assert extended.memoize is True
+        assert len(base.get_rules()) == 40
+        assert base.with_rules().get_name() == "base"
+
+    def test_reorderable_runs_cheaper_rules_first_within_priority(self):
+        """reorderable=True sorts by (-priority, complexity); the default keeps input order."""
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
+
+        words = ["refund", "broken", "error", "crash"]
+        scan = Rule(
+            name="scan",
+            condition=lambda f: any(w in f.get("text", "") for w in words),
+            action=lambda f: "scan",
+            priority=5,
+        )
+        vip = Rule.cmp("vip", "spent", ">", 1000, lambda f: "vip", priority=5)
+        pinned = Rule(
+            name="pinned",
+            condition=lambda f: True,
+            action=lambda f: "pinned",
+            priority=5,
+            complexity=0,
+        )
+        top = Rule(name="top", condition=scan.condition, action=scan.action, priority=9)
+        rules = [scan, vip, top, pinned]
+
+        reordered = RuleExecutionSet(name="cost", rules=rules, reorderable=True)
+        default = RuleExecutionSet(name="plain", rules=rules)
+
+        assert [r.name for r in reordered.rules] == ["top", "pinned", "vip", "scan"]
+        assert [r.name for r in default.rules] == ["top", "scan", "vip", "pinned"]
+        extended = reordered.with_rules(
+            Rule(name="late", condition=lambda f: True, action=lambda f: 0, priority=5)
+        )
+        assert extended.reorderable is True
+        assert [r.name for r in extended.rules][:3] == ["top", "pinned", "vip"]
+
+    def test_always_true_conditions_detected(self):
+        """Sets whose conditions are all `lambda f: True` are flagged at build time."""
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
+
+        def always(fact):
+            return True
+
+        unconditional = RuleExecutionSet(
+            name="always",
+            rules=[
+                Rule(name="a", condition=lambda f: True, action=lambda f: 1),
+                Rule(name="b", condition=always, action=lambda f: 2),
+            ],
+        )
+        mixed = RuleExecutionSet(
+            name="mixed",
+            rules=[
+                Rule(name="a", condition=lambda f: True, action=lambda f: 1),
+                Rule(name="b", condition=lambda f: 1, action=lambda f: 2),
+            ],
+        )
+
+        assert unconditional._unconditional is True
+        assert mixed._unconditional is False
+        assert RuleExecutionSet(name="empty", rules=[])._unconditional is False
+
+    def test_first_match_head_hit_does_not_sort_tail(self):
+        """FIRST_MATCH should not need the full ordering when the head matches."""
+        from machine_rules.adapters.machine_adapter import MachineRuleSession
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
+
+        rules = [
+            Rule(
+                name=f"rule_{i}",
+                condition=lambda f: True,
+                action=lambda f, i=i: i,
+                priority=i,
+            )
+            for i in range(100)
+        ]
+
+        execution_set = RuleExecutionSet(
+            name="test_set", rules=rules, properties={"strategy": "FIRST_MATCH"}
+        )
+        session = MachineRuleSession(execution_set)
+        session.add_facts([{}])
+
+        assert session.execute() == [99]
+        assert execution_set._rules is None
+
+        session.close()
+
 
 class TestMachineAdapter:
     """Test the Machine adapter implementation."""
@@ -101,6 +296,395 @@ class TestMachineAdapter:
 
         session.close()
 
+    def test_execute_returns_independent_results(self):
+        """Results returned by execute() must not change on later executions."""
+        from machine_rules.adapters.machine_adapter import MachineRuleSession
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
+
+        rule = Rule(name="echo", condition=lambda f: True, action=lambda f: f["id"])
+        session = MachineRuleSession(RuleExecutionSet(name="echo", rules=[rule]))
+
+        session.add_facts([{"id": 1}])
+        first = session.execute()
+        session.reset()
+        session.add_facts([{"id": 2}])
+        second = session.execute()
+
+        assert first == [1]
+        assert second == [2]
+
+        session.close()
+
+    def test_memoized_execution_set_reuses_condition_results(self):
+        """memoize=True evaluates each condition once per distinct fact."""
+        from machine_rules.adapters.machine_adapter import MachineRuleSession
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
+
+        calls = []
+
+        def condition(fact):
+            calls.append(fact)
+            return fact.get("value", 0) > 10
+
+        rule = Rule(name="memo", condition=condition, action=lambda f: f["value"])
+        execution_set = RuleExecutionSet(name="memo", rules=[rule], memoize=True)
+        session = MachineRuleSession(execution_set)
+        session.add_facts(
+            [
+                {"value": 15},
+                {"value": 15},
+                {"value": 5},
+                {"value": True},
+                {"value": 15, "tags": ["a"]},
+                {"value": 15, "tags": ["a"]},
+                {"value": 15, "unhashable": bytearray()},
+            ]
+        )
+
+        assert session.execute() == [15, 15, 15, 15, 15]
+        # Repeated facts hit the cache; 1 and True are not conflated
+        assert len(calls) == 5
+
+        session.close()
+
+    def test_memoized_rules_share_equivalent_conditions(self):
+        """Structurally equal conditions are evaluated once per fact across rules."""
+        from machine_rules.adapters.machine_adapter import MachineRuleSession
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
+        from machine_rules.loader.yaml_loader import YAMLRuleLoader
+
+        loaded = YAMLRuleLoader.from_dict(
+            {
+                "name": "loaded",
+                "rules": [
+                    {"name": "a", "condition": "fact.get('v', 0) > 1", "action": "'a'"},
+                    {"name": "b", "condition": "fact.get('v',0)>1", "action": "'b'"},
+                    {
+                        "name": "c",
+                        "condition": "fact.get('v', 0) > 1.0",
+                        "action": "'c'",
+                    },
+                ],
+            }
+        )
+        keys = loaded.condition_keys
+        assert keys[0] == keys[1] != keys[2]
+
+        calls = []
+
+        def condition(fact):
+            calls.append(fact)
+            return fact.get("v", 0) > 1
+
+        rules = [
+            Rule(name="x", condition=condition, action=lambda f: "x"),
+            Rule(name="y", condition=condition, action=lambda f: "y"),
+            Rule.cmp("big", "v", ">", 1, lambda f: "big"),
+            Rule.cmp("big_again", "v", ">", 1, lambda f: "big_again"),
+            Rule.cmp("is_true", "v", "==", True, lambda f: "is_true"),
+        ]
+        execution_set = RuleExecutionSet(name="shared", rules=rules, memoize=True)
+        keys = execution_set.condition_keys
+        assert keys[0] == keys[1] and keys[2] == keys[3] != keys[4]
+
+        session = MachineRuleSession(execution_set)
+        session.add_facts([{"v": 5}, {"v": 0}])
+        assert session.execute() == ["x", "y", "big", "big_again"]
+        assert len(calls) == 2
+        session.close()
+
+    def test_alpha_index_only_runs_candidate_conditions(self):
+        """Equality discriminators route facts to the rules that can match."""
+        from machine_rules.adapters.machine_adapter import MachineRuleSession
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
+        from machine_rules.loader.yaml_loader import YAMLRuleLoader
+
+        execution_set = YAMLRuleLoader.from_dict(
+            {
+                "name": "routing",
+                "rules": [
+                    {
+                        "name": f"type_{i}",
+                        "condition": f"fact.get('type') == {i} and fact.get('x', 0) > 0",
+                        "action": f"{{'rule': {i}}}",
+                        "priority": i,
+                    }
+                    for i in range(10)
+                ]
+                + [
+                    {
+                        "name": "catch_all",
+                        "condition": "fact.get('x', 0) > 0",
+                        "action": "{'rule': 'all'}",
+                        "priority": 5,
+                    }
+                ],
+            }
+        )
+        assert execution_set.alpha_index is not None
+
+        calls = []
+        counted = [
+            Rule(
+                name=rule.name,
+                condition=lambda f, c=rule.condition, n=rule.name: (
+                    calls.append(n) or c(f)
+                ),
+                action=rule.action,
+                priority=rule.priority,
+            )
+            for rule in execution_set.get_rules()
+        ]
+        for original, wrapper in zip(execution_set.get_rules(), counted):
+            wrapper._condition_expr = original._condition_expr
+        counted_set = RuleExecutionSet(name="routing", rules=counted)
+
+        session = MachineRuleSession(counted_set)
+        session.add_facts([{"type": 7, "x": 1}, {"type": 99, "x": 1}])
+        results = session.execute()
+
+        # Priority order is preserved across indexed and residual rules
+        assert results == [{"rule": 7}, {"rule": "all"}, {"rule": "all"}]
+        assert calls == ["type_7", "catch_all", "catch_all"]
+
+        # Rule.cmp equality rules are indexed too, and non-dict facts scan everything
+        cmp_set = RuleExecutionSet(
+            name="cmp",
+            rules=[
+                Rule.cmp(f"t{i}", "type", "==", i, lambda f, i=i: i)
+                for i in range(1, 11)
+            ],
+        )
+        assert cmp_set.alpha_index is not None
+        session = MachineRuleSession(cmp_set)
+        session.add_facts([{"type": 3}, {"type": [1]}, {}])
+        assert session.execute() == [3]
+
+        session.close()
+
+    def test_alpha_index_skips_conditions_that_are_only_the_test(self):
+        """A bucket hit is the match when the condition is just the equality test."""
+        from machine_rules.adapters.machine_adapter import MachineRuleSession
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
+
+        calls = []
+        rules = []
+        for i in range(10):
+            rule = Rule.cmp(f"t{i}", "type", "==", i, lambda f, i=i: i)
+            cmp_condition = rule.condition
+
+            def condition(fact, c=cmp_condition):
+                calls.append(fact)
+                return c(fact)
+
+            condition._comparison = cmp_condition._comparison
+            rule.condition = condition
+            rules.append(rule)
+        execution_set = RuleExecutionSet(name="cmp", rules=rules)
+        assert execution_set.alpha_index is not None
+        assert all(execution_set.alpha_index.exact)
+
+        session = MachineRuleSession(execution_set)
+        session.add_facts([{"type": 3}, {"type": 42}, {"type": 7}])
+        assert session.execute() == [3, 7]
+        assert calls == []
+
+        # Unhashable values can't be routed, so conditions run as usual
+        session.reset()
+        session.add_facts([{"type": {3}}])
+        assert session.execute() == []
+        assert len(calls) == 10
+
+        session.close()
+
+    def test_alpha_index_keeps_unhashable_defaults_residual(self):
+        """Equality rules with an unhashable default are scanned, not bucketed."""
+        from machine_rules.adapters.machine_adapter import MachineRuleSession
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
+
+        rules = [
+            Rule.cmp(
+                f"t{i}", "type", "==", i, lambda f, i=i: i, default=[] if i % 2 else 0
+            )
+            for i in range(20)
+        ]
+        execution_set = RuleExecutionSet(name="cmp", rules=rules)
+        alpha_index = execution_set.alpha_index
+
+        assert alpha_index is not None
+        assert alpha_index.indexed == 10
+        assert alpha_index.residual == list(range(1, 20, 2))
+        session = MachineRuleSession(execution_set)
+        session.add_facts([{"type": 3}, {"type": 4}, {}])
+        assert session.execute() == [3, 4, 0]
+        session.close()
+
+    def test_vectorized_execution_matches_per_fact_loop(self):
+        """vectorize=True gives the same results, in order, as the per-fact loop."""
+        pytest.importorskip("numpy")
+        import random
+
+        from machine_rules.adapters.machine_adapter import MachineRuleSession
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
+        from machine_rules.loader.yaml_loader import YAMLRuleLoader
+
+        loaded = YAMLRuleLoader.from_dict(
+            {
+                "name": "numeric",
+                "rules": [
+                    {
+                        "name": "band",
+                        "condition": "0 < fact.get('score', 0) <= 50",
+                        "action": "{'band': 'low'}",
+                        "priority": 3,
+                    },
+                    {
+                        "name": "combo",
+                        "condition": "fact.get('age', 0) >= 18 and "
+                        "(fact.get('score', 0) > 70 or not fact.get('debt', 0) > -5)",
+                        "action": "{'combo': fact['age']}",
+                        "priority": 2,
+                    },
+                ],
+            }
+        ).get_rules()
+        rules = list(loaded) + [
+            Rule.cmp("vip", "age", "==", 40, lambda f: "vip", priority=1)
+        ]
+
+        rng = random.Random(7)
+        facts = [
+            {
+                "age": rng.randint(10, 60),
+                "score": rng.choice([rng.randint(-10, 100), rng.random() * 100]),
+                "debt": rng.randint(-10, 10),
+            }
+            for _ in range(200)
+        ]
+
+        def run(vectorize, batch):
+            execution_set = RuleExecutionSet(
+                name="numeric", rules=rules, vectorize=vectorize
+            )
+            session = MachineRuleSession(execution_set)
+            session.add_facts(batch)
+            return execution_set, session.execute()
+
+        vectorized_set, vectorized = run(True, facts)
+        assert vectorized_set._vectorized is not None
+        assert vectorized == run(False, facts)[1]
+
+        # Non-numeric fields fall back to the per-fact loop
+        mixed = facts + [{"age": "unknown", "score": 10}]
+        assert run(True, mixed)[1] == run(False, mixed)[1]
+
+    def test_vectorized_columns_are_reused_until_facts_change(self):
+        """A stateful session packs fact fields once per set of facts."""
+        pytest.importorskip("numpy")
+        from machine_rules.adapters.machine_adapter import MachineRuleSession
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
+
+        execution_set = RuleExecutionSet(
+            name="numeric",
+            rules=[Rule.cmp("big", "x", ">", 90, lambda f: f["x"])],
+            vectorize=True,
+        )
+        session = MachineRuleSession(execution_set)
+        session.add_facts([{"x": x} for x in range(100)])
+
+        assert session.execute() == list(range(91, 100))
+        columns = session._columns[("x", 0)]
+        assert session.execute() == list(range(91, 100))
+        assert session._columns[("x", 0)] is columns
+
+        session.add_facts([{"x": 95}])
+        assert session.execute() == list(range(91, 100)) + [95]
+        assert len(session._columns[("x", 0)]) == 101
+
+        session.reset()
+        assert session._columns == {}
+        session.close()
+
+    def test_numba_equality_dispatch_matches_per_fact_loop(self):
+        """Integer routing rules dispatched by the numba kernel give the same results."""
+        pytest.importorskip("numba")
+        from machine_rules.adapters.machine_adapter import MachineRuleSession
+        from machine_rules.adapters.numba_dispatch import EqualityDispatch
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
+        from machine_rules.loader.yaml_loader import YAMLRuleLoader
+
+        rules = list(
+            YAMLRuleLoader.from_dict(
+                {
+                    "name": "routing",
+                    "rules": [
+                        {
+                            "name": f"target_{i}",
+                            "condition": f"fact.get('target') == {i}",
+                            "action": f"{{'hit': {i}}}",
+                            "priority": i % 3,
+                        }
+                        for i in range(50)
+                    ],
+                }
+            ).get_rules()
+        )
+        # A duplicate constant with an extra conjunct: both rules must be tried
+        rules.append(
+            Rule(
+                name="even_target_7",
+                condition=lambda f: f.get("target") == 7 and f.get("x", 0) % 2 == 0,
+                action=lambda f: "even",
+            )
+        )
+        rules[
+            -1
+        ]._condition_expr = "fact.get('target') == 7 and fact.get('x', 0) % 2 == 0"
+        facts = [{"target": i % 60, "x": i // 3} for i in range(200)] + [{"x": 1}]
+
+        def run(vectorize, batch):
+            execution_set = RuleExecutionSet(
+                name="routing", rules=rules, vectorize=vectorize
+            )
+            session = MachineRuleSession(execution_set)
+            session.add_facts(batch)
+            return execution_set, session.execute()
+
+        dispatched_set, dispatched = run(True, facts)
+        assert isinstance(dispatched_set._vectorized, EqualityDispatch)
+        assert dispatched == run(False, facts)[1]
+        assert "even" in dispatched
+
+        # Non-integer routing values fall back to the per-fact loop
+        mixed = facts + [{"target": "7"}]
+        assert run(True, mixed)[1] == run(False, mixed)[1]
+
+    def test_execute_without_facts_skips_rules(self):
+        """execute() returns [] without calling any condition when there are no facts."""
+        from machine_rules.adapters.machine_adapter import MachineRuleSession
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
+
+        calls = []
+        rule = Rule(
+            name="counted",
+            condition=lambda f: calls.append(f) or True,
+            action=lambda f: "fired",
+        )
+        session = MachineRuleSession(RuleExecutionSet(name="s", rules=[rule]))
+        session.add_facts([{}])
+        assert session.execute() == ["fired"]
+
+        session.reset()
+        assert session.execute() == []
+        assert len(calls) == 1
+
+        empty = MachineRuleSession(RuleExecutionSet(name="empty", rules=[]))
+        empty.add_facts([{}])
+        assert empty.execute() == []
+
+        session.close()
+        empty.close()
+
     def test_machine_rule_administrator(self):
         from machine_rules.adapters.machine_adapter import MachineRuleAdministrator
         from machine_rules.api.execution_set import Rule, RuleExecutionSet
@@ -183,8 +767,8 @@ class TestRuleServiceProviderManager:
     """Test the rule service provider manager."""
 
     def test_provider_registration(self):
-        from machine_rules.api.registry import RuleServiceProviderManager
         from machine_rules.adapters.machine_adapter import MachineRuleServiceProvider
+        from machine_rules.api.registry import RuleServiceProviderManager
 
         # Clear any existing registrations
         provider = MachineRuleServiceProvider()
@@ -207,6 +791,7 @@ class TestLoggingInsteadOfPrint:
     def test_rule_execution_errors_use_logging(self, caplog):
         """Errors during rule execution should use logging, not print."""
         import logging
+
         from machine_rules.adapters.machine_adapter import (
             MachineRuleAdministrator,
             MachineRuleRuntime,
@@ -242,6 +827,31 @@ class TestLoggingInsteadOfPrint:
 
         session.close()
 
+    def test_rule_execution_errors_are_aggregated(self, caplog):
+        """Repeated rule errors in one execute() should produce a single record."""
+        import logging
+
+        from machine_rules.adapters.machine_adapter import MachineRuleSession
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
+
+        def bad_condition(fact):
+            raise ValueError("Intentional error for testing")
+
+        rule = Rule(name="error_rule", condition=bad_condition, action=lambda f: 1)
+        session = MachineRuleSession(RuleExecutionSet(name="test_set", rules=[rule]))
+        session.add_facts([{"value": i} for i in range(5)])
+
+        with caplog.at_level(logging.ERROR):
+            session.execute()
+
+        assert len(caplog.records) == 1
+        record = caplog.records[0]
+        assert "Error executing rule error_rule" in record.getMessage()
+        assert record.exc_info is not None
+        assert record.error_counts == {"error_rule:ValueError": 5}
+
+        session.close()
+
 
 class TestStatelessSessionBehavior:
     """Test stateless vs stateful session behavior (Phase 2, Task 2.1)."""
@@ -346,6 +956,40 @@ class TestStatelessSessionBehavior:
         assert session.stateless is False
         session.close()
 
+    def test_stale_session_handles_stay_closed(self):
+        """A closed session stays closed and cannot affect later sessions."""
+        from machine_rules.adapters.machine_adapter import (
+            MachineRuleAdministrator,
+            MachineRuleRuntime,
+        )
+        from machine_rules.api.exceptions import SessionError
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
+
+        rule = Rule(name="test", condition=lambda f: True, action=lambda f: f)
+        admin = MachineRuleAdministrator()
+        admin.register_rule_execution_set(
+            "test_uri", RuleExecutionSet(name="test_set", rules=[rule])
+        )
+        runtime = MachineRuleRuntime(admin)
+
+        stale = runtime.create_rule_session("test_uri", stateless=True)
+        stale.close()
+        session = runtime.create_rule_session("test_uri", stateless=True)
+        session.add_facts([{"value": 1}])
+
+        assert session is not stale
+        with pytest.raises(SessionError, match="closed"):
+            stale.add_facts([{"value": 2}])
+        with pytest.raises(SessionError, match="closed"):
+            stale.execute()
+        with pytest.raises(SessionError, match="closed"):
+            stale.reset()
+        assert stale.facts == []
+
+        # Closing it again leaves the new session alone
+        stale.close()
+        assert session.execute() == [{"value": 1}]
+
 
 class TestExecutionStrategy:
     """Test execution strategy (FIRST_MATCH vs ALL_MATCHES)."""
@@ -487,6 +1131,65 @@ class TestExecutionStrategy:
 
         session.close()
 
+    def test_parallel_execution_preserves_fact_order(self):
+        """n_workers > 1 should return exactly what a sequential run returns."""
+        from machine_rules.adapters.machine_adapter import MachineRuleSession
+        from machine_rules.api.exceptions import RuleValidationError
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
+
+        rules = [
+            Rule(
+                name="even",
+                condition=lambda f: f["n"] % 2 == 0,
+                action=lambda f: ("even", f["n"]),
+            ),
+            Rule(
+                name="triple",
+                condition=lambda f: f["n"] % 3 == 0,
+                action=lambda f: ("triple", f["n"]),
+            ),
+        ]
+        facts = [{"n": n} for n in range(101)]
+        for properties in ({}, {"strategy": "FIRST_MATCH"}):
+            execution_set = RuleExecutionSet("test_set", rules, properties)
+            session = MachineRuleSession(execution_set)
+            session.add_facts(facts)
+            expected = session.execute()
+            assert session.execute(n_workers=4) == expected
+            assert session.execute(n_workers=200) == expected
+            with pytest.raises(RuleValidationError):
+                session.execute(n_workers=0)
+            session.close()
+
+    def test_evaluate_first_returns_highest_priority_match(self):
+        """evaluate_first() matches FIRST_MATCH execution without a session."""
+        from machine_rules.adapters.machine_adapter import (
+            MachineRuleAdministrator,
+            MachineRuleRuntime,
+        )
+        from machine_rules.api.exceptions import RuleValidationError
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
+
+        def broken(fact):
+            raise KeyError("missing")
+
+        rules = [
+            Rule(name="broken", condition=broken, action=lambda f: "x", priority=20),
+            Rule.cmp("gold", "spent", ">", 1000, lambda f: "gold", priority=10),
+            Rule.cmp("silver", "spent", ">", 100, lambda f: "silver", priority=5),
+        ]
+        admin = MachineRuleAdministrator()
+        admin.register_rule_execution_set(
+            "tiers", RuleExecutionSet("tiers", rules, {"strategy": "ALL_MATCHES"})
+        )
+        runtime = MachineRuleRuntime(admin)
+
+        assert runtime.evaluate_first("tiers", {"spent": 5000}) == "gold"
+        assert runtime.evaluate_first("tiers", {"spent": 500}) == "silver"
+        assert runtime.evaluate_first("tiers", {"spent": 5}) is None
+        with pytest.raises(RuleValidationError):
+            runtime.evaluate_first("missing", {})
+
 
 class TestCustomExceptions:
     """Test custom exception classes."""
@@ -511,8 +1214,8 @@ class TestCustomExceptions:
             MachineRuleAdministrator,
             MachineRuleRuntime,
         )
-        from machine_rules.api.execution_set import Rule, RuleExecutionSet
         from machine_rules.api.exceptions import SessionError
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
 
         rule = Rule(name="test", condition=lambda f: True, action=lambda f: {})
         execution_set = RuleExecutionSet(name="test_set", rules=[rule])
@@ -533,8 +1236,8 @@ class TestCustomExceptions:
             MachineRuleAdministrator,
             MachineRuleRuntime,
         )
-        from machine_rules.api.execution_set import Rule, RuleExecutionSet
         from machine_rules.api.exceptions import SessionError
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
 
         rule = Rule(name="test", condition=lambda f: True, action=lambda f: {})
         execution_set = RuleExecutionSet(name="test_set", rules=[rule])
@@ -555,8 +1258,8 @@ class TestCustomExceptions:
             MachineRuleAdministrator,
             MachineRuleRuntime,
         )
-        from machine_rules.api.execution_set import Rule, RuleExecutionSet
         from machine_rules.api.exceptions import SessionError
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
 
         rule = Rule(name="test", condition=lambda f: True, action=lambda f: {})
         execution_set = RuleExecutionSet(name="test_set", rules=[rule])
@@ -595,8 +1298,8 @@ class TestInputValidation:
             MachineRuleAdministrator,
             MachineRuleRuntime,
         )
-        from machine_rules.api.execution_set import Rule, RuleExecutionSet
         from machine_rules.api.exceptions import RuleValidationError
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
 
         rule = Rule(name="test", condition=lambda f: True, action=lambda f: {})
         execution_set = RuleExecutionSet(name="test_set", rules=[rule])
@@ -634,8 +1337,8 @@ class TestInputValidation:
     def test_admin_validates_uri_not_empty(self):
         """Admin should validate URI is not empty."""
         from machine_rules.adapters.machine_adapter import MachineRuleAdministrator
-        from machine_rules.api.execution_set import Rule, RuleExecutionSet
         from machine_rules.api.exceptions import RuleValidationError
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
 
         admin = MachineRuleAdministrator()
         rule = Rule(name="test", condition=lambda f: True, action=lambda f: {})
@@ -648,15 +1351,15 @@ class TestInputValidation:
 class TestThreadSafety:
     """Test thread safety for concurrent operations."""
 
-    def test_concurrent_provider_registration(self):
+    def test_concurrent_provider_registration(self, monkeypatch):
         """Multiple threads can safely register providers."""
         import threading
+
         from machine_rules.adapters.machine_adapter import MachineRuleServiceProvider
         from machine_rules.api.registry import RuleServiceProviderManager
 
-        # Clear any existing registrations
-        for uri in list(RuleServiceProviderManager.get_registered_uris()):
-            RuleServiceProviderManager.deregister(uri)
+        # Start from an empty registry; the default providers are restored after
+        monkeypatch.setattr(RuleServiceProviderManager, "_providers", {})
 
         results = []
         errors = []
@@ -688,6 +1391,7 @@ class TestThreadSafety:
     def test_concurrent_rule_registration(self):
         """Multiple threads can safely register rules."""
         import threading
+
         from machine_rules.adapters.machine_adapter import MachineRuleAdministrator
         from machine_rules.api.execution_set import Rule, RuleExecutionSet
 
@@ -729,6 +1433,7 @@ class TestThreadSafety:
     def test_concurrent_session_operations(self):
         """Multiple threads can safely create and use sessions."""
         import threading
+
         from machine_rules.adapters.machine_adapter import (
             MachineRuleAdministrator,
             MachineRuleRuntime,
@@ -6,32 +6,18 @@ the rules engine,
 including providers, loaders, sessions, and API endpoints.
 """
 
+import io
+
 import pytest
-import tempfile
-import os
-from fastapi.testclient import TestClient
 
 # Import core components and ensure initialization
-import machine_rules  # Ensure module initialization
-from machine_rules.api.registry import RuleServiceProviderManager
-from machine_rules.api.execution_set import Rule, RuleExecutionSet
+import machine_rules  # noqa: F401  # Ensure module initialization
 from machine_rules.adapters.machine_adapter import MachineRuleServiceProvider
+from machine_rules.api.execution_set import Rule, RuleExecutionSet
+from machine_rules.api.registry import RuleServiceProviderManager
 from machine_rules.loader.yaml_loader import YAMLRuleLoader
-# DMN loader removed - deprecated due to security vulnerabilities
 
-
-def get_api_provider():
-    """Helper function to safely get the API provider with proper
-    error handling."""
-    provider = RuleServiceProviderManager.get("api")
-    if provider is None:
-        # Ensure initialization if provider is not found
-        machine_rules.initialize()
-        provider = RuleServiceProviderManager.get("api")
-    assert provider is not None, (
-        "API provider should be registered after initialization"
-    )
-    return provider
+# DMN loader removed - deprecated due to security vulnerabilities
 
 
 class TestProviderRegistryIntegration:
@@ -129,7 +115,7 @@ class TestProviderRegistryIntegration:
 class TestYAMLLoaderIntegration:
     """Integration tests for YAML loader with full rule execution."""
 
-    def test_complex_yaml_rules_end_to_end(self):
+    def test_complex_yaml_rules_end_to_end(self, provider):
         """Test complex YAML rules from definition to execution."""
         yaml_content = """
 name: "financial_assessment"
@@ -170,81 +156,72 @@ rules:
     priority: 10
 """
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            f.write(yaml_content)
-            temp_path = f.name
-
-        try:
-            # Load rules
-            execution_set = YAMLRuleLoader.from_file(temp_path)
-
-            # Register with default provider
-            provider = get_api_provider()
-            admin = provider.get_rule_administrator()
-            runtime = provider.get_rule_runtime()
-
-            admin.register_rule_execution_set("financial_rules", execution_set)
-
-            # Test various financial profiles
-            test_cases = [
-                {
-                    "debt_ratio": 0.5,
-                    "income": 40000,
-                    "credit_score": 550,
-                    "loan_amount": 100000,
-                    "expected_risk": "HIGH",
-                },
-                {
-                    "debt_ratio": 0.35,
-                    "income": 80000,
-                    "credit_score": 650,
-                    "loan_amount": 50000,
-                    "expected_risk": "MEDIUM",
-                },
-                {
-                    "debt_ratio": 0.2,
-                    "income": 100000,
-                    "credit_score": 750,
-                    "loan_amount": 75000,
-                    "expected_risk": "LOW",
-                },
-            ]
-
-            session = runtime.create_rule_session("financial_rules")
-
-            for case in test_cases:
-                session.reset()
-                session.add_facts([case])
-                results = session.execute()
-
-                # All matching rules fire, so check the highest priority result
-                assert len(results) >= 1
-                # Results are ordered by priority, so first result is highest priority
-                highest_priority_result = results[0]
-                assert highest_priority_result["risk_level"] == case["expected_risk"]
-
-                if case["expected_risk"] == "HIGH":
-                    assert highest_priority_result["recommendation"] == "REJECT"
-                    assert (
-                        highest_priority_result["required_collateral"]
-                        == case["loan_amount"] * 1.5
-                    )
-                elif case["expected_risk"] == "MEDIUM":
-                    assert highest_priority_result["recommendation"] == "REVIEW"
-                    assert (
-                        highest_priority_result["required_collateral"]
-                        == case["loan_amount"] * 1.2
-                    )
-                else:
-                    assert highest_priority_result["recommendation"] == "APPROVE"
-                    assert highest_priority_result["required_collateral"] == 0
-
-            session.close()
-
-        finally:
-            os.unlink(temp_path)
-
-    def test_yaml_error_handling_integration(self):
+        # Load rules
+        execution_set = YAMLRuleLoader.from_stream(io.StringIO(yaml_content))
+
+        # Register with default provider
+        admin = provider.get_rule_administrator()
+        runtime = provider.get_rule_runtime()
+
+        admin.register_rule_execution_set("financial_rules", execution_set)
+
+        # Test various financial profiles
+        test_cases = [
+            {
+                "debt_ratio": 0.5,
+                "income": 40000,
+                "credit_score": 550,
+                "loan_amount": 100000,
+                "expected_risk": "HIGH",
+            },
+            {
+                "debt_ratio": 0.35,
+                "income": 80000,
+                "credit_score": 650,
+                "loan_amount": 50000,
+                "expected_risk": "MEDIUM",
+            },
+            {
+                "debt_ratio": 0.2,
+                "income": 100000,
+                "credit_score": 750,
+                "loan_amount": 75000,
+                "expected_risk": "LOW",
+            },
+        ]
+
+        session = runtime.create_rule_session("financial_rules")
+
+        for case in test_cases:
+            session.reset()
+            session.add_facts([case])
+            results = session.execute()
+
+            # All matching rules fire, so check the highest priority result
+            assert len(results) >= 1
+            # Results are ordered by priority, so first result is highest priority
+            highest_priority_result = results[0]
+            assert highest_priority_result["risk_level"] == case["expected_risk"]
+
+            if case["expected_risk"] == "HIGH":
+                assert highest_priority_result["recommendation"] == "REJECT"
+                assert (
+                    highest_priority_result["required_collateral"]
+                    == case["loan_amount"] * 1.5
+                )
+            elif case["expected_risk"] == "MEDIUM":
+                assert highest_priority_result["recommendation"] == "REVIEW"
+                assert (
+                    highest_priority_result["required_collateral"]
+                    == case["loan_amount"] * 1.2
+                )
+            else:
+                assert highest_priority_result["recommendation"] == "APPROVE"
+                assert highest_priority_result["required_collateral"] == 0
+
+        session.close()
+
+    def test_yaml_error_handling_integration(self, provider):
         """Test YAML loader error handling in integration context."""
         # YAML with intentional syntax error in condition
         yaml_content = """
@@ -256,31 +233,22 @@ rules:
     priority: 1
 """
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            f.write(yaml_content)
-            temp_path = f.name
+        execution_set = YAMLRuleLoader.from_stream(io.StringIO(yaml_content))
 
-        try:
-            execution_set = YAMLRuleLoader.from_file(temp_path)
-
-            provider = get_api_provider()
-            admin = provider.get_rule_administrator()
-            runtime = provider.get_rule_runtime()
-
-            admin.register_rule_execution_set("error_rules", execution_set)
-            session = runtime.create_rule_session("error_rules")
+        admin = provider.get_rule_administrator()
+        runtime = provider.get_rule_runtime()
 
-            session.add_facts([{"test": "valid"}])
-            results = session.execute()
+        admin.register_rule_execution_set("error_rules", execution_set)
+        session = runtime.create_rule_session("error_rules")
 
-            # Should handle valid rules correctly
-            assert len(results) == 1
-            assert results[0]["result"] == "valid_test"
+        session.add_facts([{"test": "valid"}])
+        results = session.execute()
 
-            session.close()
+        # Should handle valid rules correctly
+        assert len(results) == 1
+        assert results[0]["result"] == "valid_test"
 
-        finally:
-            os.unlink(temp_path)
+        session.close()
 
 
 # DMN loader integration tests removed - DMN loader deprecated and removed due to security vulnerabilities
@@ -289,7 +257,7 @@ rules:
 class TestSessionStateIntegration:
     """Integration tests for session state management."""
 
-    def test_stateful_session_accumulation(self):
+    def test_stateful_session_accumulation(self, provider):
         """Test stateful session with fact accumulation."""
 
         # Create rules that work with accumulated facts
@@ -303,7 +271,6 @@ class TestSessionStateIntegration:
         rule = Rule(name="counter", condition=count_condition, action=count_action)
         execution_set = RuleExecutionSet(name="stateful_test", rules=[rule])
 
-        provider = get_api_provider()
         admin = provider.get_rule_administrator()
         runtime = provider.get_rule_runtime()
 
@@ -325,7 +292,7 @@ class TestSessionStateIntegration:
 
         session.close()
 
-    def test_stateless_session_isolation(self):
+    def test_stateless_session_isolation(self, provider):
         """Test stateless session with fact isolation."""
         rule = Rule(
             name="isolated",
@@ -334,7 +301,6 @@ class TestSessionStateIntegration:
         )
         execution_set = RuleExecutionSet(name="isolation_test", rules=[rule])
 
-        provider = get_api_provider()
         admin = provider.get_rule_administrator()
         runtime = provider.get_rule_runtime()
 
@@ -363,7 +329,7 @@ class TestSessionStateIntegration:
 class TestRulePriorityIntegration:
     """Integration tests for rule priority and execution order."""
 
-    def test_complex_priority_execution(self):
+    def test_complex_priority_execution(self, provider):
         """Test complex priority-based rule execution."""
         # Create rules with different priorities
         rules = []
@@ -400,7 +366,6 @@ class TestRulePriorityIntegration:
 
         execution_set = RuleExecutionSet(name="priority_test", rules=rules)
 
-        provider = get_api_provider()
         admin = provider.get_rule_administrator()
         runtime = provider.get_rule_runtime()
 
@@ -431,17 +396,9 @@ class TestRulePriorityIntegration:
 class TestFastAPIIntegration:
     """Integration tests for FastAPI endpoints."""
 
-    def test_complete_api_workflow(self):
+    def test_complete_api_workflow(self, client, provider):
         """Test complete API workflow from registration to execution."""
-        # Ensure initialization
-        import machine_rules  # noqa: F401
-
-        from machine_rules.__main__ import app
-
-        client = TestClient(app)
-
         # Register rules via the provider
-        provider = get_api_provider()
         admin = provider.get_rule_administrator()
 
         # Create customer classification rules
@@ -494,14 +451,8 @@ class TestFastAPIIntegration:
             highest_priority_result = data["results"][0]
             assert highest_priority_result["tier"] == customer["expected_tier"]
 
-    def test_api_error_handling_integration(self):
+    def test_api_error_handling_integration(self, client):
         """Test API error handling with various scenarios."""
-        import machine_rules  # noqa: F401
-
-        from machine_rules.__main__ import app
-
-        client = TestClient(app)
-
         # Test non-existent ruleset
         response = client.post(
             "/execute",
@@ -517,7 +468,7 @@ class TestFastAPIIntegration:
 class TestCrossLoaderIntegration:
     """Integration tests combining different rule loaders."""
 
-    def test_mixed_rule_sources_integration(self):
+    def test_mixed_rule_sources_integration(self, provider):
         """Test integration of rules from different sources."""
         # Create programmatic rule
         prog_rule = Rule(
@@ -537,52 +488,43 @@ rules:
     priority: 50
 """
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            f.write(yaml_content)
-            yaml_path = f.name
-
-        try:
-            yaml_execution_set = YAMLRuleLoader.from_file(yaml_path)
-            yaml_rule = yaml_execution_set.get_rules()[0]
-
-            # Combine rules from different sources
-            combined_rules = [prog_rule, yaml_rule]
-            combined_execution_set = RuleExecutionSet(
-                name="mixed_rules", rules=combined_rules
-            )
+        yaml_execution_set = YAMLRuleLoader.from_stream(io.StringIO(yaml_content))
+        yaml_rule = yaml_execution_set.get_rules()[0]
 
-            provider = get_api_provider()
-            admin = provider.get_rule_administrator()
-            runtime = provider.get_rule_runtime()
+        # Combine rules from different sources
+        combined_rules = [prog_rule, yaml_rule]
+        combined_execution_set = RuleExecutionSet(
+            name="mixed_rules", rules=combined_rules
+        )
 
-            admin.register_rule_execution_set("mixed_sources", combined_execution_set)
-            session = runtime.create_rule_session("mixed_sources")
+        admin = provider.get_rule_administrator()
+        runtime = provider.get_rule_runtime()
 
-            # Test execution with different source types
-            test_facts = [
-                {"source": "program", "data": "test1"},
-                {"source": "yaml", "data": "test2"},
-            ]
+        admin.register_rule_execution_set("mixed_sources", combined_execution_set)
+        session = runtime.create_rule_session("mixed_sources")
 
-            session.add_facts(test_facts)
-            results = session.execute()
+        # Test execution with different source types
+        test_facts = [
+            {"source": "program", "data": "test1"},
+            {"source": "yaml", "data": "test2"},
+        ]
 
-            assert len(results) == 2
+        session.add_facts(test_facts)
+        results = session.execute()
 
-            # Results should be ordered by priority (programmatic first)
-            assert results[0]["processed_by"] == "programmatic"
-            assert results[1]["processed_by"] == "yaml"
+        assert len(results) == 2
 
-            session.close()
+        # Results should be ordered by priority (programmatic first)
+        assert results[0]["processed_by"] == "programmatic"
+        assert results[1]["processed_by"] == "yaml"
 
-        finally:
-            os.unlink(yaml_path)
+        session.close()
 
 
 class TestPerformanceIntegration:
     """Integration tests for performance scenarios."""
 
-    def test_large_ruleset_performance(self):
+    def test_large_ruleset_performance(self, provider):
         """Test performance with large number of rules."""
         # Create 100 rules with different priorities
         rules = []
@@ -598,7 +540,6 @@ class TestPerformanceIntegration:
 
         execution_set = RuleExecutionSet(name="large_set", rules=rules)
 
-        provider = get_api_provider()
         admin = provider.get_rule_administrator()
         runtime = provider.get_rule_runtime()
 
@@ -621,6 +562,48 @@ class TestPerformanceIntegration:
 
         session.close()
 
+    def test_large_cmp_ruleset_performance(self, provider):
+        """Large Rule.cmp equality sets are routed through the alpha index."""
+        # Create 100 rules with different priorities
+        rules = []
+        for i in range(100):
+            rules.append(
+                Rule.cmp(
+                    f"rule_{i}",
+                    "target",
+                    "==",
+                    i,
+                    action=lambda f, rule_id=i: {"matched_rule": rule_id},
+                    priority=100 - i,  # Descending priority
+                    default=None,
+                )
+            )
+
+        execution_set = RuleExecutionSet(name="large_cmp_set", rules=rules)
+        assert execution_set.alpha_index is not None
+
+        admin = provider.get_rule_administrator()
+        runtime = provider.get_rule_runtime()
+
+        admin.register_rule_execution_set("large_cmp_rules", execution_set)
+        session = runtime.create_rule_session("large_cmp_rules")
+
+        # Test with facts that match various rules
+        test_facts = [{"target": i} for i in range(0, 100, 10)]
+
+        session.add_facts(test_facts)
+        results = session.execute()
+
+        # Should get one result per fact
+        assert len(results) == len(test_facts)
+
+        # Results should be properly matched
+        for i, result in enumerate(results):
+            expected_rule_id = i * 10  # Based on our test data
+            assert result["matched_rule"] == expected_rule_id
+
+        session.close()
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
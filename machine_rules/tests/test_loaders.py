@@ -2,9 +2,9 @@
 Test suite for rule loaders
 """
 
+import io
+
 import pytest
-import tempfile
-import os
 
 
 class TestYAMLRuleLoader:
@@ -55,7 +55,7 @@ class TestYAMLRuleLoader:
         assert rules[0].action(high_income_fact) == {"category": "high_income"}
         assert rules[1].action(low_income_fact) == {"category": "standard"}
 
-    def test_yaml_loader_from_file(self):
+    def test_yaml_loader_from_file(self, tmp_path):
         from machine_rules.loader.yaml_loader import YAMLRuleLoader
 
         yaml_content = """
@@ -68,28 +68,72 @@ rules:
     priority: 1
 """
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            f.write(yaml_content)
-            temp_path = f.name
+        rules_file = tmp_path / "rules.yaml"
+        rules_file.write_text(yaml_content)
+
+        execution_set = YAMLRuleLoader.from_file(rules_file)
+
+        assert execution_set.get_name() == "file_test_rules"
+        assert len(execution_set.get_rules()) == 1
+
+        rule = execution_set.get_rules()[0]
+        assert rule.name == "test_rule"
+        assert rule.condition({"value": 15}) is True
+        assert rule.action({"value": 15}) == {"result": "pass"}
+
+    def test_yaml_loader_from_json_file(self, tmp_path):
+        import json
+
+        from machine_rules.loader.yaml_loader import YAMLRuleLoader
+
+        rules_file = tmp_path / "rules.JSON"
+        rules_file.write_text(
+            json.dumps(
+                {
+                    "name": "json_rules",
+                    "strategy": "FIRST_MATCH",
+                    "rules": [
+                        {
+                            "name": "test_rule",
+                            "condition": "fact.get('value', 0) > 10",
+                            "action": "{'result': 'pass'}",
+                        }
+                    ],
+                }
+            )
+        )
+
+        execution_set = YAMLRuleLoader.from_file(str(rules_file))
 
-        try:
-            execution_set = YAMLRuleLoader.from_file(temp_path)
+        assert execution_set.get_name() == "json_rules"
+        assert execution_set.get_properties()["strategy"] == "FIRST_MATCH"
+        rule = execution_set.get_rules()[0]
+        assert rule.condition({"value": 15}) is True
+        assert rule.action({"value": 15}) == {"result": "pass"}
+
+    def test_yaml_loader_from_stream(self):
+        from machine_rules.loader.yaml_loader import YAMLRuleLoader
+
+        yaml_content = """
+name: "stream_test_rules"
+rules:
+  - name: "test_rule"
+    condition: "fact.get('value', 0) > 10"
+    action: "{'result': 'pass'}"
+"""
 
-            assert execution_set.get_name() == "file_test_rules"
-            assert len(execution_set.get_rules()) == 1
+        for source in (io.StringIO(yaml_content), yaml_content):
+            execution_set = YAMLRuleLoader.from_stream(source)
 
+            assert execution_set.get_name() == "stream_test_rules"
             rule = execution_set.get_rules()[0]
-            assert rule.name == "test_rule"
             assert rule.condition({"value": 15}) is True
             assert rule.action({"value": 15}) == {"result": "pass"}
 
-        finally:
-            os.unlink(temp_path)
-
     def test_yaml_loader_validates_structure(self):
         """YAML loader should validate document structure."""
-        from machine_rules.loader.yaml_loader import YAMLRuleLoader
         from machine_rules.api.exceptions import RuleValidationError
+        from machine_rules.loader.yaml_loader import YAMLRuleLoader
 
         # Missing 'name' field
         with pytest.raises(RuleValidationError, match="name|required"):
@@ -101,8 +145,8 @@ rules:
 
     def test_yaml_loader_validates_rule_fields(self):
         """Each rule should have required fields."""
-        from machine_rules.loader.yaml_loader import YAMLRuleLoader
         from machine_rules.api.exceptions import RuleValidationError
+        from machine_rules.loader.yaml_loader import YAMLRuleLoader
 
         # Rule missing 'name'
         with pytest.raises(RuleValidationError, match="name|required"):
@@ -124,8 +168,8 @@ rules:
 
     def test_yaml_loader_validates_expression_safety(self):
         """YAML loader should detect unsafe expressions during validation."""
-        from machine_rules.loader.yaml_loader import YAMLRuleLoader
         from machine_rules.api.exceptions import RuleValidationError
+        from machine_rules.loader.yaml_loader import YAMLRuleLoader
 
         # Attempt to use __import__
         with pytest.raises(RuleValidationError, match="unsafe|security|forbidden"):
@@ -157,10 +201,386 @@ rules:
                 }
             )
 
+    @pytest.mark.parametrize(
+        "expr",
+        [
+            "fact.__class__",
+            "fact.get('x').__globals__",
+            "'{0.__class__}'.format(fact)",
+            "lambda: 1",
+            "[x for x in fact]",
+            "undefined_name > 1",
+            "getattr(fact, 'x')",
+            "fact.get('x',",
+        ],
+    )
+    def test_yaml_loader_rejects_unsafe_expressions_at_load(self, expr):
+        """Expressions are validated once when the rule is loaded."""
+        from machine_rules.api.exceptions import RuleValidationError
+        from machine_rules.loader.yaml_loader import YAMLRuleLoader
+
+        with pytest.raises(RuleValidationError, match="unsafe|syntax"):
+            YAMLRuleLoader.from_dict(
+                {
+                    "name": "test",
+                    "rules": [{"name": "rule1", "condition": expr, "action": "{}"}],
+                }
+            )
+
+    def test_yaml_loader_accepts_unsafe_words_in_string_literals(self):
+        """Only the parsed syntax is checked, never the text of string constants."""
+        from machine_rules.loader.yaml_loader import YAMLRuleLoader
+
+        execution_set = YAMLRuleLoader.from_dict(
+            {
+                "name": "test",
+                "rules": [
+                    {
+                        "name": "rule1",
+                        "condition": "fact.get('note') == 'reopen (ticket)'",
+                        "action": "'eval (pending)'",
+                    }
+                ],
+            }
+        )
+        rule = execution_set.get_rules()[0]
+
+        assert rule.condition({"note": "reopen (ticket)"}) is True
+        assert rule.action({}) == "eval (pending)"
+
+    @pytest.mark.parametrize(
+        "expr",
+        [
+            "'a' * 10**8",
+            "'a' * 100000000",
+            "100000000 * 'a'",
+            "fact.get('s', '').ljust(100000000)",
+        ],
+    )
+    def test_yaml_loader_rejects_oversized_sequences_at_load(self, expr):
+        """Constant sequence sizes are checked before the rule is built."""
+        from machine_rules.api.exceptions import RuleValidationError
+        from machine_rules.loader.yaml_loader import YAMLRuleLoader
+
+        with pytest.raises(RuleValidationError, match="unsafe|limit"):
+            YAMLRuleLoader.from_dict(
+                {
+                    "name": "test",
+                    "rules": [{"name": "rule1", "condition": "True", "action": expr}],
+                }
+            )
+
+    def test_yaml_loader_limits_sequence_sizes_at_runtime(self):
+        """Sizes known only from the fact are checked before the sequence is built."""
+        from machine_rules.adapters.machine_adapter import MachineRuleSession
+        from machine_rules.loader.yaml_loader import YAMLRuleLoader
+
+        for strategy in ("ALL_MATCHES", "FIRST_MATCH"):
+            execution_set = YAMLRuleLoader.from_dict(
+                {
+                    "name": "test",
+                    "strategy": strategy,
+                    "rules": [
+                        {
+                            "name": "padded",
+                            "condition": "fact['s'] * fact['n'] != ''",
+                            "action": "fact['s'] * fact['n']",
+                        }
+                    ],
+                }
+            )
+            session = MachineRuleSession(execution_set)
+            session.add_facts([{"s": "ab", "n": 2}, {"s": "ab", "n": 10**8}])
+
+            # The oversized fact's condition is logged and treated as False
+            assert session.execute() == ["abab"]
+
+    def test_yaml_loader_keeps_source_expressions(self):
+        """Loaded rules keep their source expressions for introspection."""
+        from machine_rules.loader.yaml_loader import YAMLRuleLoader
+
+        execution_set = YAMLRuleLoader.from_dict(
+            {
+                "name": "test",
+                "rules": [
+                    {
+                        "name": "rule1",
+                        "condition": "fact.get('x', 0) > 1",
+                        "action": "{'x': int(fact['x'])}",
+                    }
+                ],
+            }
+        )
+        rule = execution_set.get_rules()[0]
+
+        assert rule._condition_expr == "fact.get('x', 0) > 1"
+        assert rule._action_expr == "{'x': int(fact['x'])}"
+        assert rule.condition({"x": 2}) is True
+        assert rule.action({"x": "2"}) == {"x": 2}
+
+    def test_yaml_loader_shares_compiled_expressions(self):
+        """Identical expression sources compile to one shared function factory."""
+        from machine_rules.loader.yaml_loader import _compile_expression
+
+        first = _compile_expression("fact.get('shared', 0) > 1")
+        second = _compile_expression("fact.get('shared', 0) > 1")
+
+        assert first is second
+
+    def test_yaml_loader_dict_actions_use_templates(self):
+        """Dict-literal actions copy their constant entries and compute the rest."""
+        from machine_rules.loader.yaml_loader import YAMLRuleLoader
+
+        def load_action(src):
+            rule = {"name": "rule1", "condition": "True", "action": src}
+            execution_set = YAMLRuleLoader.from_dict({"name": "test", "rules": [rule]})
+            return execution_set.get_rules()[0].action
+
+        action = load_action(
+            "{'risk': 'HIGH', 'collateral': fact.get('loan', 0) * 1.5, 'ok': False}"
+        )
+        first = action({"loan": 100})
+        second = action({"loan": 10})
+
+        assert first == {"risk": "HIGH", "collateral": 150.0, "ok": False}
+        assert list(first) == ["risk", "collateral", "ok"]
+        # Each call returns a new dict; mutating one result can't leak into another
+        first["risk"] = "LOW"
+        assert second == {"risk": "HIGH", "collateral": 15.0, "ok": False}
+        assert action({"loan": 1}) == {"risk": "HIGH", "collateral": 1.5, "ok": False}
+
+        # Literals without constant values or with repeated keys evaluate as written
+        assert load_action("{'a': fact['x']}")({"x": [1]}) == {"a": [1]}
+        assert load_action("{'a': 1, 'a': fact['x']}")({"x": 2}) == {"a": 2}
+        assert load_action("{1: 'int', True: 'bool'}")({}) == {1: "bool"}
+
+    def test_yaml_loader_strategy(self):
+        """A rule set's strategy is read into its properties and validated."""
+        from machine_rules.adapters.machine_adapter import MachineRuleSession
+        from machine_rules.api.exceptions import RuleValidationError
+        from machine_rules.loader.yaml_loader import YAMLRuleLoader
+
+        data = {
+            "name": "tiers",
+            "strategy": "FIRST_MATCH",
+            "rules": [
+                {
+                    "name": "vip",
+                    "condition": "fact['spent'] > 100",
+                    "action": "'VIP'",
+                    "priority": 2,
+                },
+                {
+                    "name": "standard",
+                    "condition": "True",
+                    "action": "'Standard'",
+                    "priority": 1,
+                },
+            ],
+        }
+
+        execution_set = YAMLRuleLoader.from_dict(data)
+        assert execution_set.get_properties()["strategy"] == "FIRST_MATCH"
+        session = MachineRuleSession(execution_set)
+        session.add_facts([{"spent": 500}, {"spent": 5}])
+        assert session.execute() == ["VIP", "Standard"]
+
+        del data["strategy"]
+        assert "strategy" not in YAMLRuleLoader.from_dict(data).get_properties()
+
+        data["strategy"] = "SOMETIMES"
+        with pytest.raises(RuleValidationError, match="strategy"):
+            YAMLRuleLoader.from_dict(data)
+
+    def test_first_match_compiles_loaded_rules(self):
+        """FIRST_MATCH over loaded rules runs one compiled function per fact."""
+        from machine_rules.adapters.machine_adapter import (
+            MachineRuleSession,
+            _execute_first_match,
+            _RuleErrors,
+        )
+        from machine_rules.loader.yaml_loader import YAMLRuleLoader
+
+        execution_set = YAMLRuleLoader.from_dict(
+            {
+                "name": "tiers",
+                "strategy": "FIRST_MATCH",
+                "rules": [
+                    {
+                        "name": "broken",
+                        "condition": "fact['missing'] > 1",
+                        "action": "'never'",
+                        "priority": 9,
+                    },
+                    {
+                        "name": "vip",
+                        "condition": "fact.get('spent', 0) > 1000",
+                        "action": "{'tier': 'VIP', 'spent': fact['spent']}",
+                        "priority": 5,
+                    },
+                    {
+                        "name": "silent",
+                        "condition": "fact.get('spent', 0) > 100",
+                        "action": "None",
+                        "priority": 3,
+                    },
+                    {
+                        "name": "new",
+                        "condition": "fact.get('spent', 0) == 0",
+                        "action": "'New'",
+                        "priority": 1,
+                    },
+                ],
+            }
+        )
+        facts = [{"spent": 5000}, {"spent": 500}, {"spent": 0}, {"spent": 50}]
+
+        session = MachineRuleSession(execution_set)
+        session.add_facts(facts)
+        results = session.execute()
+
+        assert execution_set._first_match is not None
+        expected: list = []
+        _execute_first_match(execution_set, facts, False, expected, _RuleErrors())
+        assert results == expected == [{"tier": "VIP", "spent": 5000}, "New"]
+
+    def test_first_match_compiled_action_errors_try_next_rule(self, caplog):
+        """A raising action is called once, logged, and the next rule is tried."""
+        import logging
+
+        from machine_rules.adapters.machine_adapter import (
+            MachineRuleAdministrator,
+            MachineRuleRuntime,
+            MachineRuleSession,
+        )
+        from machine_rules.api.execution_set import Rule, RuleExecutionSet
+
+        calls = []
+
+        def explode(fact):
+            calls.append(fact)
+            raise ValueError("boom")
+
+        first = Rule("explodes", condition=lambda f: True, action=explode, priority=2)
+        second = Rule("fallback", condition=lambda f: True, action=lambda f: "b")
+        for rule, action in ((first, "'a'"), (second, "'b'")):
+            rule._condition_expr = "True"
+            rule._action_expr = action
+        execution_set = RuleExecutionSet(
+            name="test", rules=[first, second], properties={"strategy": "FIRST_MATCH"}
+        )
+
+        session = MachineRuleSession(execution_set)
+        session.add_facts([{"id": 1}])
+        with caplog.at_level(logging.ERROR):
+            assert session.execute() == ["b"]
+        assert execution_set._first_match is not None
+        assert calls == [{"id": 1}]
+        assert "Error executing rule explodes: boom" in caplog.text
+
+        admin = MachineRuleAdministrator()
+        admin.register_rule_execution_set("test_uri", execution_set)
+        assert MachineRuleRuntime(admin).evaluate_first("test_uri", {"id": 2}) == "b"
+        assert calls == [{"id": 1}, {"id": 2}]
+
+    def test_first_match_compiled_condition_errors_evaluate_once(self, caplog):
+        """A raising condition is evaluated once and logged like the loop does."""
+        import logging
+
+        from machine_rules.adapters.machine_adapter import MachineRuleSession
+        from machine_rules.loader.yaml_loader import YAMLRuleLoader
+
+        class CountingFact(dict):
+            lookups = 0
+
+            def __getitem__(self, key):
+                CountingFact.lookups += 1
+                return super().__getitem__(key)
+
+        execution_set = YAMLRuleLoader.from_dict(
+            {
+                "name": "broken",
+                "strategy": "FIRST_MATCH",
+                "rules": [
+                    {
+                        "name": "broken",
+                        "condition": "fact['missing'] > 1",
+                        "action": "'never'",
+                    }
+                ],
+            }
+        )
+
+        session = MachineRuleSession(execution_set)
+        session.add_facts([CountingFact()])
+        with caplog.at_level(logging.ERROR):
+            assert session.execute() == []
+        assert execution_set._first_match is not None
+        assert CountingFact.lookups == 1
+        assert "Error evaluating condition for rule broken" in caplog.text
+
+    def test_yaml_loader_vectorize_option(self):
+        """vectorize: true enables batch evaluation for the loaded set."""
+        pytest.importorskip("numpy")
+        from machine_rules.adapters.machine_adapter import MachineRuleSession
+        from machine_rules.loader.yaml_loader import YAMLRuleLoader
+
+        data = {
+            "name": "income",
+            "vectorize": True,
+            "rules": [
+                {
+                    "name": "high_income",
+                    "condition": "fact.get('income', 0) > 100000",
+                    "action": "{'category': 'high_income'}",
+                }
+            ],
+        }
+
+        execution_set = YAMLRuleLoader.from_dict(data)
+        assert execution_set.vectorize is True
+        assert YAMLRuleLoader.from_dict({**data, "vectorize": False}).vectorize is False
+
+        session = MachineRuleSession(execution_set)
+        session.add_facts([{"income": i * 1000} for i in range(200)])
+        assert len(session.execute()) == 99
+        assert execution_set._vectorized is not None
+
+    def test_yaml_loader_rules_handle_their_own_errors(self, caplog):
+        """Loaded conditions and actions log failures and fall back without raising."""
+        import logging
+
+        from machine_rules.loader.yaml_loader import YAMLRuleLoader
+
+        rule = YAMLRuleLoader.from_dict(
+            {
+                "name": "errors",
+                "rules": [
+                    {
+                        "name": "divide",
+                        "condition": "fact['total'] / fact['count'] > 1",
+                        "action": "{'ratio': fact['total'] / fact['count'], 'ok': True}",
+                    }
+                ],
+            }
+        ).get_rules()[0]
+
+        # The error handling is compiled into the expression's own function
+        assert rule.condition.__code__.co_name == "evaluate"
+        assert rule.condition({"total": 4, "count": 2}) is True
+        assert rule.action({"total": 4, "count": 2}) == {"ratio": 2.0, "ok": True}
+
+        with caplog.at_level(logging.ERROR):
+            assert rule.condition({"total": 4, "count": 0}) is False
+            assert rule.action({"total": 4}) is None
+        messages = [record.getMessage() for record in caplog.records]
+        assert messages[0].startswith("Error evaluating condition for rule divide")
+        assert messages[1].startswith("Error evaluating action for rule divide")
+
     def test_yaml_loader_validates_types(self):
         """YAML loader should validate field types."""
-        from machine_rules.loader.yaml_loader import YAMLRuleLoader
         from machine_rules.api.exceptions import RuleValidationError
+        from machine_rules.loader.yaml_loader import YAMLRuleLoader
 
         # 'rules' should be a list
         with pytest.raises(RuleValidationError, match="rules|list|array"):
@@ -190,8 +610,8 @@ class TestIntegrationWithLoaders:
     """Integration tests using loaders with the full rule engine."""
 
     def test_yaml_integration(self):
-        from machine_rules.loader.yaml_loader import YAMLRuleLoader
         from machine_rules.adapters.machine_adapter import MachineRuleServiceProvider
+        from machine_rules.loader.yaml_loader import YAMLRuleLoader
 
         # Create rules using YAML loader
         data = {
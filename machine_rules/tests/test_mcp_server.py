@@ -6,17 +6,18 @@ correct behavior, error handling, and security enforcement.
 """
 
 import pytest
+
+from machine_rules.api.exceptions import RuleEngineError, RuleValidationError
 from machine_rules.mcp_server import (
-    register_rule_set,
+    _admin,
+    check_expression,
+    deregister_rule_set,
     execute_rules,
-    list_rule_sets,
     get_rule_set,
-    deregister_rule_set,
-    check_expression,
     get_rule_set_resource,
-    _admin,
+    list_rule_sets,
+    register_rule_set,
 )
-from machine_rules.api.exceptions import RuleEngineError, RuleValidationError
 
 
 @pytest.fixture(autouse=True)
@@ -322,12 +323,22 @@ class TestCheckExpression:
     """Tests for the check_expression tool."""
 
     def test_safe_expression(self):
-        # validate_expression evaluates with empty names, so 'fact' is undefined.
-        # Expressions using undefined names are still considered safe (not a security issue).
         result = check_expression("fact.get('value', 0) > 100")
-        assert "expression" in result
+        assert result["safe"] is True
         assert result["expression"] == "fact.get('value', 0) > 100"
 
+    @pytest.mark.parametrize(
+        "expression", ["fact.get('name', '').ljust(10)", "value > 100", "fact.get("]
+    )
+    def test_matches_loader_validation(self, expression):
+        # Anything the loader would reject is reported as unsafe
+        result = check_expression(expression)
+        assert result["safe"] is False
+        with pytest.raises(RuleValidationError):
+            register_rule_set(
+                "checked", [{"name": "r", "condition": expression, "action": "1"}]
+            )
+
     def test_unsafe_import(self):
         result = check_expression("__import__('os')")
         assert result["safe"] is False
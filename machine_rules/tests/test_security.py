@@ -5,9 +5,9 @@ These tests verify that security vulnerabilities are properly blocked.
 All tests should PASS to ensure the system is secure.
 """
 
-import pytest
 from pathlib import Path
 
+import pytest
 
 # DMN loader security tests removed - DMN loader has been completely removed from the project
 
@@ -27,21 +27,21 @@ class TestSafeExpressionEvaluator:
 
     def test_safe_eval_blocks_builtins_access(self):
         """Test that __builtins__ access is blocked."""
-        from machine_rules.security.safe_evaluator import safe_eval, SecurityError
+        from machine_rules.security.safe_evaluator import SecurityError, safe_eval
 
         with pytest.raises(SecurityError):
             safe_eval("__builtins__.__import__('os').system('ls')", {})
 
     def test_safe_eval_blocks_dunder_access(self):
         """Test that dunder method access is blocked."""
-        from machine_rules.security.safe_evaluator import safe_eval, SecurityError
+        from machine_rules.security.safe_evaluator import SecurityError, safe_eval
 
         with pytest.raises(SecurityError):
             safe_eval("().__class__.__bases__[0].__subclasses__()", {})
 
     def test_safe_eval_blocks_exec_eval(self):
         """Test that eval/exec are not accessible."""
-        from machine_rules.security.safe_evaluator import safe_eval, SecurityError
+        from machine_rules.security.safe_evaluator import SecurityError, safe_eval
 
         with pytest.raises(SecurityError):
             safe_eval("eval('1+1')", {})
@@ -51,14 +51,14 @@ class TestSafeExpressionEvaluator:
 
     def test_safe_eval_blocks_import(self):
         """Test that import statements are blocked."""
-        from machine_rules.security.safe_evaluator import safe_eval, SecurityError
+        from machine_rules.security.safe_evaluator import SecurityError, safe_eval
 
         with pytest.raises(SecurityError):
             safe_eval("__import__('os')", {})
 
     def test_safe_eval_blocks_file_operations(self):
         """Test that file operations are blocked."""
-        from machine_rules.security.safe_evaluator import safe_eval, SecurityError
+        from machine_rules.security.safe_evaluator import SecurityError, safe_eval
 
         with pytest.raises(SecurityError):
             safe_eval("open('/etc/passwd')", {})
@@ -85,43 +85,42 @@ class TestSafeExpressionEvaluator:
 
     def test_safe_eval_blocks_lambda(self):
         """Test that lambda expressions are blocked."""
-        from machine_rules.security.safe_evaluator import safe_eval, SecurityError
+        from machine_rules.security.safe_evaluator import SecurityError, safe_eval
 
         with pytest.raises(SecurityError, match="lambda"):
             safe_eval("lambda x: x + 1", {})
 
     def test_safe_eval_blocks_compile(self):
         """Test that compile is blocked."""
-        from machine_rules.security.safe_evaluator import safe_eval, SecurityError
+        from machine_rules.security.safe_evaluator import SecurityError, safe_eval
 
-        # Note: 'compile' contains 'eval' so it matches 'eval' pattern first
         with pytest.raises(SecurityError, match="dangerous pattern"):
             safe_eval("compile('1+1', 'string', 'eval')", {})
 
     def test_safe_eval_blocks_globals_access(self):
         """Test that __globals__ access is blocked."""
-        from machine_rules.security.safe_evaluator import safe_eval, SecurityError
+        from machine_rules.security.safe_evaluator import SecurityError, safe_eval
 
         with pytest.raises(SecurityError, match="__globals__"):
             safe_eval("(lambda: None).__globals__", {})
 
     def test_safe_eval_blocks_code_access(self):
         """Test that __code__ access is blocked."""
-        from machine_rules.security.safe_evaluator import safe_eval, SecurityError
+        from machine_rules.security.safe_evaluator import SecurityError, safe_eval
 
         with pytest.raises(SecurityError, match="__code__"):
             safe_eval("(lambda: None).__code__", {})
 
     def test_safe_eval_undefined_name(self):
         """Test that undefined names raise SecurityError."""
-        from machine_rules.security.safe_evaluator import safe_eval, SecurityError
+        from machine_rules.security.safe_evaluator import SecurityError, safe_eval
 
         with pytest.raises(SecurityError, match="undefined or unsafe names"):
             safe_eval("undefined_variable", {})
 
     def test_safe_eval_undefined_function(self):
         """Test that undefined functions raise SecurityError."""
-        from machine_rules.security.safe_evaluator import safe_eval, SecurityError
+        from machine_rules.security.safe_evaluator import SecurityError, safe_eval
 
         with pytest.raises(SecurityError, match="undefined or unsafe names"):
             safe_eval("undefined_function()", {})
@@ -135,12 +134,68 @@ class TestSafeExpressionEvaluator:
 
     def test_safe_eval_general_error(self):
         """Test that general errors are caught and wrapped."""
-        from machine_rules.security.safe_evaluator import safe_eval, SecurityError
+        from machine_rules.security.safe_evaluator import SecurityError, safe_eval
 
         # Division by zero should be caught and wrapped
         with pytest.raises(SecurityError, match="Expression evaluation failed"):
             safe_eval("1 / 0", {})
 
+    def test_compile_safe_checks_once_and_evaluates_repeatedly(self):
+        """compile_safe() rejects unsafe input up front and reuses the parse."""
+        from machine_rules.security import SecurityError, compile_safe
+
+        is_high = compile_safe("fact.get('score', 0) > 80")
+        assert is_high({"fact": {"score": 90}}) is True
+        assert is_high({"fact": {"score": 10}}) is False
+
+        with pytest.raises(SecurityError, match="dangerous pattern"):
+            compile_safe("__import__('os')")
+        with pytest.raises(ValueError, match="Invalid expression syntax"):
+            compile_safe("x +")
+        with pytest.raises(SecurityError, match="undefined or unsafe names"):
+            compile_safe("missing > 1")({})
+
+    def test_safe_eval_uses_syntax_whitelist(self):
+        """Checks are structural: unlisted syntax is rejected, string contents are not."""
+        from machine_rules.security.safe_evaluator import SecurityError, safe_eval
+
+        assert safe_eval(
+            "'evaluation' in fact.get('notes', '')", {"fact": {"notes": "evaluation"}}
+        )
+        assert safe_eval("-x if x < 0 else x", {"x": -3}) == 3
+
+        with pytest.raises(SecurityError, match="disallowed syntax: listcomp"):
+            safe_eval("[c for c in 'abc']", {})
+        with pytest.raises(SecurityError, match="disallowed syntax"):
+            safe_eval("(y := 1)", {})
+        with pytest.raises(SecurityError, match="dangerous pattern: _private"):
+            safe_eval("fact._private", {"fact": {}})
+        # The YAML loader checks expressions with this same whitelist
+        with pytest.raises(SecurityError, match="dangerous pattern: ljust"):
+            safe_eval("'a'.ljust(10)", {})
+        with pytest.raises(ValueError, match="Invalid expression syntax"):
+            safe_eval("x = 1", {})
+
+    def test_repeated_expressions_reuse_checked_parse(self):
+        """Checks run once per expression string; rejections are not cached."""
+        from machine_rules.security import SecurityError, safe_eval
+        from machine_rules.security.safe_evaluator import _compile_checked
+
+        expression = "fact.get('repeat_score', 0) * 2"
+        before = _compile_checked.cache_info()
+        results = [
+            safe_eval(expression, {"fact": {"repeat_score": n}}) for n in range(5)
+        ]
+        after = _compile_checked.cache_info()
+
+        assert results == [0, 2, 4, 6, 8]
+        assert after.misses - before.misses == 1
+        assert after.hits - before.hits == 4
+
+        for _ in range(2):
+            with pytest.raises(SecurityError, match="dangerous pattern"):
+                safe_eval("__import__('os')", {})
+
 
 class TestValidateExpression:
     """Test expression validation function."""